@@ -26,7 +26,7 @@ hiddenimports = ['mysql.connector.plugins.caching_sha2_password']
 hiddenimports += collect_submodules('mysql.connector.plugins')
 
 # ✅ extra zekerheid: menu importeert deze, maar we pinnen toch
-hiddenimports += ['cinema_affiche', 'cinema_borderel']
+hiddenimports += ['cinema_affiche', 'cinema_borderel', 'cinema_schema']
 
 DATAS = []
 add_file("assets/logo.png", "assets")
@@ -1,23 +1,45 @@
 import io
 import os
+import argparse
+import hashlib
+import copy
 import sys
 import json
+import zlib
 import math
+import mmap
+import queue
 import mimetypes
+import stat
+import shutil
 import subprocess
 import logging
+import threading
+import multiprocessing
 import datetime as dt
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple, Union, Iterable, Callable
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-from PIL import Image, ImageDraw, ImageFont, ImageTk
+from PIL import Image, ImageDraw, ImageFilter, ImageFont, ImageTk
+
+try:
+    from PIL import ImageCms
+except Exception:
+    ImageCms = None
+
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
 
 
 # Windows logo Helper
@@ -99,8 +121,10 @@ def _apply_tk_scaling(root: tk.Misc, scale: float):
 # Install: pip install mysql-connector-python
 try:
     import mysql.connector
+    from mysql.connector import pooling
 except Exception:
     mysql = None
+    pooling = None
     mysql_connector_available = False
 else:
     mysql_connector_available = True
@@ -131,9 +155,10 @@ FONTS_DIR = resource_path("fonts")
 # Writable dirs (NOT in app bundle)
 APPDATA_DIR = Path.home() / ".cinema_backoffice"
 LOGS_DIR = APPDATA_DIR / "logs"
-TMP_DIR = APPDATA_DIR / "tmp_db_images"
+LEGACY_TMP_DIR = APPDATA_DIR / "tmp_db_images"   # pre-blob-cache temp files, removed on first start
+IMAGE_CACHE_DIR = APPDATA_DIR / "image_cache"
+NORMALIZED_DIR = APPDATA_DIR / "normalized_images"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
-TMP_DIR.mkdir(parents=True, exist_ok=True)
 
 logging.basicConfig(
     filename=str(LOGS_DIR / "cinema_affiche.log"),
@@ -171,6 +196,44 @@ RED_3D = (200, 0, 0)
 FOOTER_H_PX = 56
 FOOTER_TEXT = "UREN IN HET ROOD = 3D  *  NV = NEDERLANDSE VERSIE  *  OV = ORIGINELE VERSIE"
 
+# MySQLStore connection pool
+MYSQL_POOL_SIZE = 3
+
+# Persistent cache of DB images (by SHA-256), survives sessions
+IMAGE_CACHE_MB = 1024
+
+# Poster/title import: sRGB, at most this many times the largest slot (300 DPI)
+IMPORT_OVERSAMPLE = 2.0
+IMPORT_JPEG_QUALITY = 90
+
+# Fitted poster cache (renderer): memory budget for already-resized slot images
+POSTER_CACHE_MB = 256
+
+# Contain + edge-fill posters: box blur radius (px) on the replicated margins, 0 = off
+EDGE_FILL_BLUR = 0
+
+# Render scales whose pages/fonts the renderer keeps (preview + export); older scales are dropped
+RENDER_SCALES_KEPT = 2
+
+# Finished pages kept per render scale, keyed by AfficheState content hash
+PAGE_MEMO_SIZE = 3
+
+# Rasterized text sprites kept by the renderer (distinct strings per font size)
+TEXT_SPRITE_CACHE_SIZE = 4096
+
+# PDF export: "vector" (table/text as PDF operators, posters as images) or "raster" (one 300 DPI image)
+PDF_BACKEND = os.environ.get("CINEMA_AFFICHE_PDF", "vector").strip().lower()
+PDF_POSTER_JPEG_QUALITY = 90
+PDF_FONT_NAME = "AfficheSans"
+
+# Fit modes for poster/title slots
+FIT_BEST_TOP = "best_fit_top"
+FIT_CONTAIN_EDGE = "contain_edge_fill"
+FIT_COVER = "cover"
+
+# Image modes Image.reduce() handles; others are converted before the decode-time downscale
+_REDUCE_MODES = frozenset({"L", "LA", "RGB", "RGBA", "CMYK", "I", "F"})
+
 # Base sizes (used for scaling)
 BASE_HEADER1_H_PX = HEADER1_H_PX
 BASE_HEADER2_H_PX = HEADER2_H_PX
@@ -219,7 +282,11 @@ def _try_font_file(path: Path, size: int) -> Optional[ImageFont.FreeTypeFont]:
     except Exception:
         return None
 
-def load_modern_font(size: int) -> ImageFont.ImageFont:
+
+def _font_candidates() -> List[str]:
+    """Font files/names in order of preference (truetype() accepts both)."""
+    out: List[str] = []
+
     # 1) project fonts (mee in build als je fonts/ in datas zet)
     for fn in [
         "Inter-Regular.ttf",
@@ -231,20 +298,15 @@ def load_modern_font(size: int) -> ImageFont.ImageFont:
     ]:
         p = FONTS_DIR / fn
         if p.exists():
-            f = _try_font_file(p, size)
-            if f:
-                return f
+            out.append(str(p))
 
     # 2) macOS fonts by name
-    for name in [
+    out += [
         "SF Pro Display Regular",
         "SF Pro Text Regular",
         "Avenir Next Regular",
         "Helvetica Neue",
-    ]:
-        f = _try_font_by_name(name, size)
-        if f:
-            return f
+    ]
 
     # 3) Windows: load by FILE PATH from C:\Windows\Fonts (werkt ook in PyInstaller)
     if sys.platform.startswith("win"):
@@ -259,24 +321,168 @@ def load_modern_font(size: int) -> ImageFont.ImageFont:
         ]:
             p = win_fonts / fn
             if p.exists():
-                f = _try_font_file(p, size)
-                if f:
-                    return f
+                out.append(str(p))
 
     # 4) Linux-ish fallback by name
-    for name in ["DejaVuSans.ttf", "Arial.ttf"]:
-        f = _try_font_by_name(name, size)
-        if f:
-            return f
+    out += ["DejaVuSans.ttf", "Arial.ttf"]
+    return out
 
-    # 5) Last resort: bitmap default (maar dan maken we hem groter om “mini text” te vermijden)
-    #    (PIL default is tiny on Windows)
+
+def _font_fingerprint() -> str:
+    """Hash of the candidate list and the FONTS_DIR listing; changes when a font is added/replaced."""
+    listing = []
     try:
-        return ImageFont.load_default(size=max(14, int(size * 0.9)))
-    except Exception:
-        return ImageFont.load_default()
+        for entry in sorted(os.scandir(FONTS_DIR), key=lambda e: e.name):
+            st = entry.stat()
+            listing.append((entry.name, st.st_size, st.st_mtime_ns))
+    except OSError:
+        pass
+    blob = json.dumps({"fonts_dir": str(FONTS_DIR), "listing": listing, "candidates": _font_candidates()})
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class FontRegistry:
+    """
+    Resolves the affiche font once per process and caches FreeTypeFont objects
+    per (path, size). The resolved file path is remembered in APPDATA together
+    with a fingerprint of the candidates, so the next start skips the discovery
+    scan unless a font was added, removed or replaced.
+    """
+
+    def __init__(self, store_path: Path):
+        self.store_path = store_path
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._resolved = False
+        self._fonts: Dict[Tuple[Optional[str], int], ImageFont.ImageFont] = {}
+
+    def _load_stored(self) -> Optional[str]:
+        try:
+            data = json.loads(self.store_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        path = data.get("path") or ""
+        if data.get("fingerprint") != _font_fingerprint() or not os.path.isfile(path):
+            return None
+        return path if _try_font_file(Path(path), 12) else None
+
+    def _store(self, path: str):
+        try:
+            self.store_path.write_text(
+                json.dumps({"path": path, "fingerprint": _font_fingerprint()}), encoding="utf-8"
+            )
+        except Exception as e:
+            logging.warning(f"Font path not stored: {e}")
+
+    def _discover(self) -> Optional[str]:
+        for cand in _font_candidates():
+            f = _try_font_by_name(cand, 12)
+            if f:
+                # truetype() searches system dirs for bare names; .path is the file it found
+                return str(getattr(f, "path", "") or cand)
+        return None
+
+    def font_path(self) -> Optional[str]:
+        """Resolved font file, or None when only PIL's default font is available."""
+        with self._lock:
+            if not self._resolved:
+                self._path = self._load_stored()
+                if self._path is None:
+                    self._path = self._discover()
+                    if self._path:
+                        self._store(self._path)
+                self._resolved = True
+            return self._path
+
+    def get(self, size: int) -> ImageFont.ImageFont:
+        size = max(1, int(size))
+        path = self.font_path()
+        key = (path, size)
+        f = self._fonts.get(key)
+        if f is not None:
+            return f
+
+        f = _try_font_by_name(path, size) if path else None
+        if f is None:
+            # Last resort: bitmap default (maar dan maken we hem groter om “mini text” te vermijden)
+            #    (PIL default is tiny on Windows)
+            try:
+                f = ImageFont.load_default(size=max(14, int(size * 0.9)))
+            except Exception:
+                f = ImageFont.load_default()
+        with self._lock:
+            return self._fonts.setdefault(key, f)
+
+
+FONT_REGISTRY = FontRegistry(APPDATA_DIR / "font_cache.json")
+
+
+def load_modern_font(size: int) -> ImageFont.ImageFont:
+    return FONT_REGISTRY.get(size)
+
+
+
+@dataclass(frozen=True)
+class ImageSource:
+    """
+    Where a poster/title image comes from: a file path, an in-memory blob, or a
+    cache file that is memory-mapped instead of read. Sources with a sha256 are
+    identified by content, so the renderer needs no stat() for them.
+    Slots hold either a plain path string or an ImageSource; "" = empty.
+    """
+    name: str                                   # original filename (display, mime, JSON)
+    path: str = ""
+    data: Optional[bytes] = field(default=None, compare=False, repr=False)
+    sha256: str = ""
+    mapped: bool = False
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str, sha256: str = "") -> "ImageSource":
+        return cls(name=name, data=data, sha256=sha256 or hashlib.sha256(data).hexdigest())
+
+    @classmethod
+    def from_cache_file(cls, path: str, name: str, sha256: str) -> "ImageSource":
+        return cls(name=name, path=path, sha256=sha256, mapped=True)
+
+    def exists(self) -> bool:
+        return self.data is not None or (bool(self.path) and os.path.isfile(self.path))
+
+    @contextmanager
+    def open(self):
+        """Image.open() on the source; the underlying buffer/map is closed afterwards."""
+        if self.data is not None:
+            with Image.open(io.BytesIO(self.data)) as im:
+                yield im
+        elif self.mapped:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with Image.open(mm) as im:
+                    yield im
+        else:
+            with Image.open(self.path) as im:
+                yield im
+
+    def read_bytes(self) -> bytes:
+        if self.data is not None:
+            return self.data
+        with open(self.path, "rb") as f:
+            return f.read()
 
 
+ImageSourceLike = Union[str, ImageSource]
+
+
+def as_image_source(src: ImageSourceLike) -> Optional[ImageSource]:
+    """Slot value -> ImageSource (plain strings are file paths); None for an empty slot."""
+    if isinstance(src, ImageSource):
+        return src
+    path = (src or "").strip()
+    return ImageSource(name=os.path.basename(path), path=path) if path else None
+
+
+def image_source_name(src: ImageSourceLike) -> str:
+    s = as_image_source(src)
+    return s.name if s else ""
+
 
 @dataclass
 class FilmRow:
@@ -287,15 +493,15 @@ class FilmRow:
     good_icons: List[str] = field(default_factory=list)
 
     # per-row image that fills the entire FILM cell; if set, typed title is hidden on the affiche
-    title_image: str = ""
+    title_image: ImageSourceLike = ""
 
     cells: List[str] = field(default_factory=lambda: [""] * 14)
 
 
 @dataclass
 class PosterLayout:
-    top: List[str] = field(default_factory=lambda: [""] * MAX_TOP)
-    bottom: List[str] = field(default_factory=lambda: [""] * MAX_BOTTOM)
+    top: List[ImageSourceLike] = field(default_factory=lambda: [""] * MAX_TOP)
+    bottom: List[ImageSourceLike] = field(default_factory=lambda: [""] * MAX_BOTTOM)
 
 
 @dataclass
@@ -330,28 +536,86 @@ def day_col_label(d: dt.date) -> str:
 # -----------------------------
 # MySQL storage layer
 # -----------------------------
+@dataclass(frozen=True)
+class AfficheImageRef:
+    """Metadata of one stored slot image; the blob itself is fetched separately."""
+    slot_type: str
+    slot_index: int
+    filename: str
+    mime: str
+    sha256: str = ""       # empty for legacy rows that keep the blob inline
+    size_bytes: int = 0
+
+
 class MySQLStore:
     """
     Tables:
       affiches(start_date DATE PRIMARY KEY, state_json LONGTEXT, updated_at TIMESTAMP)
+      images(
+          sha256 CHAR(64) PRIMARY KEY,      -- content address, each blob stored once
+          mime VARCHAR(80),
+          size_bytes BIGINT,
+          data LONGBLOB
+      )
       affiche_images(
           start_date DATE,
           slot_type ENUM('top','bottom','title'),
           slot_index INT,
           filename VARCHAR(255),
           mime VARCHAR(80),
-          data LONGBLOB,
+          data LONGBLOB,                    -- legacy rows only; new rows reference images
+          image_sha256 CHAR(64),
           PRIMARY KEY(start_date, slot_type, slot_index),
           FOREIGN KEY (start_date) REFERENCES affiches(start_date) ON DELETE CASCADE
       )
     """
     def __init__(self, cfg: Dict[str, str]):
         self.cfg = cfg
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name=f"affiche_pool_{id(self)}",
+                    pool_size=MYSQL_POOL_SIZE,
+                    **self.cfg,
+                )
+            return self._pool
+
+    def _reset_pool(self):
+        with self._pool_lock:
+            self._pool = None
 
     def connect(self):
+        """
+        Warm connection from the pool. Each one is pinged before use and
+        reconnected if the server/VPN dropped it; close() hands it back.
+        """
         if not mysql_connector_available:
             raise RuntimeError("mysql-connector-python is niet geïnstalleerd. Doe: pip install mysql-connector-python")
-        return mysql.connector.connect(**self.cfg)
+        try:
+            cn = self._get_pool().get_connection()
+        except mysql.connector.errors.PoolError:
+            # all pooled connections busy (e.g. a background load): plain connection
+            return mysql.connector.connect(**self.cfg)
+        except mysql.connector.Error:
+            # pool could not (re)connect: drop it so the next call starts fresh
+            self._reset_pool()
+            raise
+
+        try:
+            cn.ping(reconnect=True, attempts=2, delay=1)
+        except mysql.connector.Error:
+            try:
+                cn.close()
+            except Exception:
+                pass
+            self._reset_pool()
+            cn = self._get_pool().get_connection()
+            cn.ping(reconnect=True, attempts=1, delay=0)
+        return cn
 
     def ensure_schema(self):
         cn = self.connect()
@@ -389,6 +653,40 @@ class MySQLStore:
                 cn.commit()
             except Exception:
                 cn.rollback()
+
+            # content-addressed blobs (affiche_images only keeps the hash)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS images (
+                    sha256 CHAR(64) NOT NULL PRIMARY KEY,
+                    mime VARCHAR(80),
+                    size_bytes BIGINT NOT NULL,
+                    data LONGBLOB NOT NULL,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+            """)
+            cn.commit()
+
+            cur.execute("""
+                SELECT COUNT(*) FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'affiche_images' AND COLUMN_NAME = 'image_sha256';
+            """)
+            if int(cur.fetchone()[0]) == 0:
+                cur.execute("ALTER TABLE affiche_images ADD COLUMN image_sha256 CHAR(64) NULL AFTER mime;")
+                cn.commit()
+
+            # orphan checks look blobs up by hash
+            cur.execute("""
+                SELECT COUNT(*) FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'affiche_images'
+                  AND INDEX_NAME = 'idx_affiche_images_sha256';
+            """)
+            if int(cur.fetchone()[0]) == 0:
+                cur.execute("ALTER TABLE affiche_images ADD INDEX idx_affiche_images_sha256 (image_sha256);")
+                cn.commit()
+
+            # blobs left behind by affiches deleted outside the app (the FK cascades affiche_images only)
+            self._prune_images(cur)
+            cn.commit()
         finally:
             cn.close()
 
@@ -398,21 +696,59 @@ class MySQLStore:
         return mime or "application/octet-stream"
 
     @staticmethod
-    def _read_file_bytes(path: str) -> Tuple[bytes, str, str]:
-        fn = os.path.basename(path)
-        mime = MySQLStore._guess_mime(fn)
+    def _sha256_file(path: str) -> str:
+        h = hashlib.sha256()
         with open(path, "rb") as f:
-            data = f.read()
-        return data, fn, mime
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    @staticmethod
+    def _missing_hashes(cur, hashes: List[str]) -> List[str]:
+        """Which of these hashes the server does not have yet (one query)."""
+        if not hashes:
+            return []
+        marks = ",".join(["%s"] * len(hashes))
+        # shared lock: a concurrent prune cannot drop a blob this save is about to reference
+        cur.execute(f"SELECT sha256 FROM images WHERE sha256 IN ({marks}) LOCK IN SHARE MODE;", tuple(hashes))
+        present = {row[0] for row in cur.fetchall()}
+        return [h for h in hashes if h not in present]
+
+    @staticmethod
+    def _prune_images(cur, hashes: Optional[Iterable[str]] = None) -> int:
+        """Delete images rows no affiche_images row references; only among hashes if given. Returns the count."""
+        where = "NOT EXISTS (SELECT 1 FROM affiche_images ai WHERE ai.image_sha256 = images.sha256)"
+        if hashes is None:
+            cur.execute(f"DELETE FROM images WHERE {where};")
+        else:
+            hashes = list(hashes)
+            if not hashes:
+                return 0
+            marks = ",".join(["%s"] * len(hashes))
+            cur.execute(f"DELETE FROM images WHERE sha256 IN ({marks}) AND {where};", tuple(hashes))
+        return cur.rowcount
 
     def save_affiche(
         self,
         start_date: dt.date,
         state_json: str,
-        top_paths: List[str],
-        bottom_paths: List[str],
-        title_paths: List[str],
+        top_paths: List[ImageSourceLike],
+        bottom_paths: List[ImageSourceLike],
+        title_paths: List[ImageSourceLike],
     ) -> None:
+        # hash locally first: unchanged posters never leave this machine again
+        slots: List[Tuple[str, int, str, str, str]] = []   # (slot_type, idx, filename, mime, sha256)
+        source_by_hash: Dict[str, ImageSource] = {}
+        for slot_type, paths in (("top", top_paths), ("bottom", bottom_paths), ("title", title_paths)):
+            for idx, p in enumerate(paths):
+                src = as_image_source(p)
+                if src is None or not src.exists():
+                    continue
+                fn = src.name
+                digest = src.sha256 or self._sha256_file(src.path)
+                source_by_hash.setdefault(digest, src)
+                slots.append((slot_type, idx, fn, self._guess_mime(fn), digest))
+
         cn = self.connect()
         try:
             cn.start_transaction()
@@ -424,34 +760,32 @@ class MySQLStore:
                 ON DUPLICATE KEY UPDATE state_json=VALUES(state_json);
             """, (start_date, state_json))
 
-            cur.execute("DELETE FROM affiche_images WHERE start_date=%s;", (start_date,))
-
-            for idx, p in enumerate(top_paths):
-                if not p:
-                    continue
-                data, fn, mime = self._read_file_bytes(p)
+            for digest in self._missing_hashes(cur, list(source_by_hash)):
+                src = source_by_hash[digest]
+                data, fn = src.read_bytes(), src.name
+                mime = self._guess_mime(fn)
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise RuntimeError(f"Bestand gewijzigd tijdens opslaan: {fn}")
                 cur.execute("""
-                    INSERT INTO affiche_images (start_date, slot_type, slot_index, filename, mime, data)
-                    VALUES (%s, 'top', %s, %s, %s, %s);
-                """, (start_date, idx, fn, mime, data))
+                    INSERT IGNORE INTO images (sha256, mime, size_bytes, data)
+                    VALUES (%s, %s, %s, %s);
+                """, (digest, mime, len(data), data))
 
-            for idx, p in enumerate(bottom_paths):
-                if not p:
-                    continue
-                data, fn, mime = self._read_file_bytes(p)
-                cur.execute("""
-                    INSERT INTO affiche_images (start_date, slot_type, slot_index, filename, mime, data)
-                    VALUES (%s, 'bottom', %s, %s, %s, %s);
-                """, (start_date, idx, fn, mime, data))
+            cur.execute("""
+                SELECT DISTINCT image_sha256 FROM affiche_images
+                WHERE start_date=%s AND image_sha256 IS NOT NULL;
+            """, (start_date,))
+            previous = {row[0] for row in cur.fetchall()}
 
-            for idx, p in enumerate(title_paths):
-                if not p or not os.path.isfile(p):
-                    continue
-                data, fn, mime = self._read_file_bytes(p)
-                cur.execute("""
-                    INSERT INTO affiche_images (start_date, slot_type, slot_index, filename, mime, data)
-                    VALUES (%s, 'title', %s, %s, %s, %s);
-                """, (start_date, idx, fn, mime, data))
+            cur.execute("DELETE FROM affiche_images WHERE start_date=%s;", (start_date,))
+            if slots:
+                cur.executemany("""
+                    INSERT INTO affiche_images (start_date, slot_type, slot_index, filename, mime, image_sha256)
+                    VALUES (%s, %s, %s, %s, %s, %s);
+                """, [(start_date, st, idx, fn, mime, digest) for st, idx, fn, mime, digest in slots])
+
+            # blobs this affiche no longer uses, unless another affiche still does
+            self._prune_images(cur, previous - set(source_by_hash))
 
             cn.commit()
         except Exception:
@@ -460,7 +794,22 @@ class MySQLStore:
         finally:
             cn.close()
 
-    def load_affiche(self, start_date: dt.date) -> Tuple[str, Dict[Tuple[str, int], Tuple[str, str, bytes]]]:
+    def list_affiches(self, start: dt.date, end: dt.date) -> List[dt.date]:
+        """Start dates of all stored affiches in [start, end], oldest first."""
+        cn = self.connect()
+        try:
+            cur = cn.cursor()
+            cur.execute("""
+                SELECT start_date FROM affiches
+                WHERE start_date BETWEEN %s AND %s
+                ORDER BY start_date;
+            """, (start, end))
+            return [row[0] for row in cur.fetchall()]
+        finally:
+            cn.close()
+
+    def load_affiche_meta(self, start_date: dt.date) -> Tuple[str, List[AfficheImageRef]]:
+        """state_json plus per-slot image metadata, without any blob data."""
         cn = self.connect()
         try:
             cur = cn.cursor()
@@ -471,25 +820,589 @@ class MySQLStore:
             state_json = row[0]
 
             cur.execute("""
-                SELECT slot_type, slot_index, filename, mime, data
-                FROM affiche_images
-                WHERE start_date=%s;
+                SELECT ai.slot_type, ai.slot_index, ai.filename, ai.mime, ai.image_sha256,
+                       COALESCE(i.size_bytes, LENGTH(ai.data), 0)
+                FROM affiche_images ai
+                LEFT JOIN images i ON i.sha256 = ai.image_sha256
+                WHERE ai.start_date=%s
+                ORDER BY FIELD(ai.slot_type, 'top', 'title', 'bottom'), ai.slot_index;
             """, (start_date,))
-            images_map: Dict[Tuple[str, int], Tuple[str, str, bytes]] = {}
-            for slot_type, slot_index, filename, mime, data in cur.fetchall():
-                images_map[(slot_type, int(slot_index))] = (filename or "", mime or "", data or b"")
-            return state_json, images_map
+            refs = [
+                AfficheImageRef(slot_type, int(slot_index), filename or "", mime or "", sha or "", int(size or 0))
+                for slot_type, slot_index, filename, mime, sha, size in cur.fetchall()
+            ]
+            return state_json, refs
         finally:
             cn.close()
 
+    def fetch_image_blob(self, start_date: dt.date, ref: AfficheImageRef, cn=None) -> bytes:
+        """Blob for one slot. Pass cn to reuse one connection for a series of fetches."""
+        own = cn is None
+        if own:
+            cn = self.connect()
+        try:
+            cur = cn.cursor()
+            if ref.sha256:
+                cur.execute("SELECT data FROM images WHERE sha256=%s;", (ref.sha256,))
+            else:
+                cur.execute("""
+                    SELECT data FROM affiche_images
+                    WHERE start_date=%s AND slot_type=%s AND slot_index=%s;
+                """, (start_date, ref.slot_type, ref.slot_index))
+            row = cur.fetchone()
+            cur.close()
+            return (row[0] or b"") if row else b""
+        finally:
+            if own:
+                cn.close()
+
+
+# -----------------------------
+# Persistent image cache (DB blobs by hash)
+# -----------------------------
+class ImageBlobCache:
+    """
+    On-disk cache of downloaded affiche images, keyed by SHA-256:
+      <root>/<sha[:2]>/<sha><ext>
+    - writes are atomic (tmp file + os.replace) and only accepted if the data matches its hash
+    - a cached file is re-hashed the first time it is used in a process; corrupt files are dropped
+    - LRU by mtime (touched on every hit); evicts to below the size cap, but never a file
+      handed out in this session (the editor may still be showing it)
+    - a running byte total is kept, so the directory is only scanned on the first put()
+      and when the total passes the cap again, not for every blob
+    """
+    def __init__(self, root: Path, budget_mb: float = IMAGE_CACHE_MB):
+        self.root = root
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._verified: set = set()
+        self._in_use: set = set()
+        self._total: Optional[int] = None   # bytes on disk, None until the first scan
+        self._scan_above = self.budget_bytes
+
+    @staticmethod
+    def _ext(filename: str) -> str:
+        ext = Path(filename).suffix.lower() if filename else ""
+        return ext if (ext and len(ext) <= 6) else ".img"
+
+    def _path(self, sha256: str, filename: str) -> Path:
+        return self.root / sha256[:2] / f"{sha256}{self._ext(filename)}"
+
+    @staticmethod
+    def _sha256_of(path: Path) -> str:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def get(self, sha256: str, filename: str = "", size_bytes: int = 0) -> Optional[str]:
+        """Path of the cached image, or None if absent/corrupt."""
+        if not sha256:
+            return None
+        path = self._path(sha256, filename)
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = str(path)
+        try:
+            if size_bytes and st.st_size != size_bytes:
+                raise ValueError("size mismatch")
+            if key not in self._verified:
+                if self._sha256_of(path) != sha256:
+                    raise ValueError("hash mismatch")
+                with self._lock:
+                    self._verified.add(key)
+            os.utime(path, None)
+        except Exception as e:
+            logging.warning(f"Image cache entry dropped ({path.name}): {e}")
+            try:
+                path.unlink()
+                with self._lock:
+                    if self._total is not None:
+                        self._total -= st.st_size
+            except OSError:
+                pass
+            return None
+        with self._lock:
+            self._in_use.add(key)
+        return key
+
+    def put(self, sha256: str, data: bytes, filename: str = "") -> str:
+        """Store data under its hash (computed here if sha256 is empty) and return the path."""
+        digest = hashlib.sha256(data).hexdigest()
+        if sha256 and digest != sha256:
+            raise ValueError(f"Image data does not match hash {sha256[:12]}…")
+        path = self._path(digest, filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.part")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        key = str(path)
+        with self._lock:
+            self._verified.add(key)
+            self._in_use.add(key)
+            if self._total is not None:
+                self._total += len(data) - replaced
+            need_scan = self._total is None or self._total > self._scan_above
+        if need_scan:
+            self.evict()
+        return key
+
+    def evict(self):
+        """Scan the cache dir, evict oldest files to 90% of the cap and reset the running total."""
+        entries = []
+        total = 0
+        for p in self.root.glob("*/*"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            if p.name.endswith(".part"):
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+
+        if total > self.budget_bytes:
+            # evict below the cap so the next scan is some puts away
+            target = int(self.budget_bytes * 0.9)
+            entries.sort(key=lambda e: e[0])
+            with self._lock:
+                in_use = set(self._in_use)
+            for _mtime, size, p in entries:
+                if total <= target:
+                    break
+                if str(p) in in_use:
+                    continue
+                try:
+                    p.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+        with self._lock:
+            self._total = total
+            # files in use can keep us over the cap: then rescan only after another 10% growth
+            self._scan_above = max(self.budget_bytes, total + self.budget_bytes // 10)
+
+
+IMAGE_CACHE = ImageBlobCache(IMAGE_CACHE_DIR)
+
+
+def _remove_legacy_tmp_dir():
+    """Older versions unpacked DB images into LEGACY_TMP_DIR; IMAGE_CACHE replaced it, so drop what is left once."""
+    if LEGACY_TMP_DIR.is_dir():
+        shutil.rmtree(LEGACY_TMP_DIR, ignore_errors=True)
+
+
+# -----------------------------
+# Fitted image cache
+# -----------------------------
+class FittedImageCache:
+    """
+    Bounded LRU cache (memory budget in MB) of slot-sized images.
+    Key: (path, mtime_ns, file size, target w, target h, fit mode)
+    """
+    def __init__(self, budget_mb: float = POSTER_CACHE_MB):
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._items: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _nbytes(img: Image.Image) -> int:
+        w, h = img.size
+        return w * h * len(img.getbands())
+
+    def get(self, key: tuple) -> Optional[Image.Image]:
+        img = self._items.get(key)
+        if img is not None:
+            self._items.move_to_end(key)
+        return img
+
+    def put(self, key: tuple, img: Image.Image):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= self._nbytes(old)
+        size = self._nbytes(img)
+        if size > self.budget_bytes:
+            return
+        self._items[key] = img
+        self._bytes += size
+        while self._bytes > self.budget_bytes and self._items:
+            _k, evicted = self._items.popitem(last=False)
+            self._bytes -= self._nbytes(evicted)
+
+    def clear(self):
+        self._items.clear()
+        self._bytes = 0
+
+
+# -----------------------------
+# Raster PDF
+# -----------------------------
+@dataclass(frozen=True)
+class RasterPdfOptions:
+    encoding: str = "flate"     # "flate" (lossless) or "jpeg"
+    jpeg_quality: int = 90
+    flate_level: int = 6
+    dpi: int = DPI              # 150/200 downsample for e-mail/social media
+
+
+# Export choices in the UI; None = vector backend
+PDF_EXPORT_PRESETS: Dict[str, Optional[RasterPdfOptions]] = {
+    "Vector (drukwerk)": None,
+    "Afbeelding 300 DPI": RasterPdfOptions("flate", flate_level=6, dpi=300),
+    "Afbeelding 300 DPI JPEG": RasterPdfOptions("jpeg", jpeg_quality=92, dpi=300),
+    "Afbeelding 200 DPI JPEG": RasterPdfOptions("jpeg", jpeg_quality=85, dpi=200),
+    "Afbeelding 150 DPI JPEG (e-mail)": RasterPdfOptions("jpeg", jpeg_quality=80, dpi=150),
+}
+
+
+def _encode_pdf_page(img: Image.Image, options: RasterPdfOptions) -> Tuple[bytes, str, int, int]:
+    """
+    (stream, filter, px_w, px_h) of a rendered page for _write_image_pdf: encoded once
+    (JPEG or Flate at the chosen level); pages rendered above options.dpi are downsampled first.
+    """
+    img = img.convert("RGB")
+    target_w = int(round(A4_W_PX * options.dpi / DPI))
+    if target_w < img.width:
+        target_h = max(1, int(round(img.height * target_w / img.width)))
+        img = img.resize((target_w, target_h), Image.LANCZOS)
+
+    if options.encoding == "jpeg":
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=int(options.jpeg_quality), optimize=True)
+        return buf.getvalue(), "DCTDecode", img.width, img.height
+    return zlib.compress(img.tobytes(), int(options.flate_level)), "FlateDecode", img.width, img.height
+
+
+def _write_image_pdf(out, pages: Iterable[Tuple[bytes, str, int, int]], page_w_pt: float, page_h_pt: float) -> int:
+    """
+    PDF with one already-encoded RGB image stretched over each page, written to a
+    binary file object. Streams are written as-is (DCTDecode = JPEG file, FlateDecode =
+    zlib of raw RGB), so nothing is decoded or re-encoded on the way. Pages are written
+    as they arrive and the page tree goes last, so a long catalogue is never held in
+    memory as a whole. Returns the number of pages.
+    """
+    pos = 0
+    offsets: Dict[int, int] = {}
+
+    def put(num: int, body: bytes):
+        nonlocal pos
+        offsets[num] = pos
+        chunk = f"{num} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+        out.write(chunk)
+        pos += len(chunk)
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    out.write(header)
+    pos += len(header)
+
+    # every page draws its own /Im0 with the same content stream
+    content = f"q {page_w_pt:.4f} 0 0 {page_h_pt:.4f} 0 0 cm /Im0 Do Q".encode("ascii")
+    put(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    put(3, f"<< /Length {len(content)} >>\nstream\n".encode("ascii") + content + b"\nendstream")
+
+    kids: List[int] = []
+    num = 4
+    for data, pdf_filter, px_w, px_h in pages:
+        put(num, (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_w_pt:.4f} {page_h_pt:.4f}] "
+                  f"/Resources << /XObject << /Im0 {num + 1} 0 R >> >> /Contents 3 0 R >>").encode("ascii"))
+        put(num + 1, (f"<< /Type /XObject /Subtype /Image /Width {px_w} /Height {px_h} /ColorSpace /DeviceRGB "
+                      f"/BitsPerComponent 8 /Filter /{pdf_filter} /Length {len(data)} >>\nstream\n").encode("ascii")
+            + data + b"\nendstream")
+        kids.append(num)
+        num += 2
+    put(2, f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>".encode("ascii"))
+
+    xref = pos
+    out.write(f"xref\n0 {num}\n0000000000 65535 f \n".encode("ascii"))
+    for i in range(1, num):
+        out.write(f"{offsets[i]:010d} 00000 n \n".encode("ascii"))
+    out.write(f"trailer\n<< /Size {num} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+    return len(kids)
+
+
+def _image_pdf_bytes(data: bytes, pdf_filter: str, px_w: int, px_h: int, page_w_pt: float, page_h_pt: float) -> bytes:
+    """One-page PDF with a single already-encoded RGB image stretched over the page."""
+    out = io.BytesIO()
+    _write_image_pdf(out, [(data, pdf_filter, px_w, px_h)], page_w_pt, page_h_pt)
+    return out.getvalue()
+
+
+# -----------------------------
+# Layout
+# -----------------------------
+def _split_units(total: int, n: int) -> Tuple[int, ...]:
+    base = total // n
+    arr = [base] * n
+    arr[-1] += total - base * n
+    return tuple(arr)
+
+
+Box = Tuple[int, int, int, int]
 
-def safe_write_blob_to_tmp(start_date: str, slot_type: str, idx: int, filename: str, blob: bytes) -> str:
-    ext = Path(filename).suffix if filename else ".img"
-    safe_name = f"{start_date}_{slot_type}_{idx}{ext}"
-    out_path = TMP_DIR / safe_name
-    with open(out_path, "wb") as f:
-        f.write(blob)
-    return str(out_path)
+
+@dataclass(frozen=True)
+class AfficheLayout:
+    """
+    Page geometry in pixels for one (film_rows, ui_scale, scale). Boxes are
+    (x0, y0, x1, y1) with x1/y1 exclusive; each band owns its box.
+    """
+    scale: float
+    page_w: int
+    page_h: int
+    film_rows: int
+    top_cols: int
+    bottom_cols: int
+    top_h: int
+    top_widths: Tuple[int, ...]
+    header1_h: int
+    header2_h: int
+    row_h: int
+    footer_h: int
+    table_x0: int
+    table_x1: int
+    table_y0: int
+    table_y1: int
+    film_w: int
+    duur_w: int
+    versie_w: int
+    good_w: int
+    day_widths: Tuple[int, ...]
+    rows_y0: int
+    footer_y0: int
+    footer_y1: int
+    bottom_y0: int
+    bottom_h: int
+    bottom_row_hs: Tuple[int, ...]
+    bottom_widths: Tuple[int, ...]
+
+    @property
+    def table_w(self) -> int:
+        return self.table_x1 - self.table_x0
+
+    @property
+    def col_widths(self) -> Tuple[int, ...]:
+        """FILM, DUUR, VERSIE, GOED GEZIEN, then the 14 day columns."""
+        return (self.film_w, self.duur_w, self.versie_w, self.good_w) + self.day_widths
+
+    def top_slot_box(self, i: int) -> Box:
+        x = sum(self.top_widths[:i])
+        return x, 0, x + self.top_widths[i], self.top_h
+
+    def bottom_slot_box(self, idx: int) -> Box:
+        r, c = divmod(idx, self.bottom_cols)
+        x = sum(self.bottom_widths[:c])
+        y = self.bottom_y0 + (self.bottom_row_hs[0] if r else 0)
+        return x, y, x + self.bottom_widths[c], y + self.bottom_row_hs[r]
+
+    def header_box(self) -> Box:
+        return self.table_x0, self.table_y0, self.table_x1, self.rows_y0
+
+    def row_box(self, r: int) -> Box:
+        y0 = self.rows_y0 + r * self.row_h
+        return self.table_x0, y0, self.table_x1, y0 + self.row_h
+
+    def footer_box(self) -> Box:
+        return self.table_x0, self.footer_y0, self.table_x1, self.footer_y1
+
+
+@lru_cache(maxsize=64)
+def compute_layout(film_rows: int, ui_scale: float = 1.0, scale: float = 1.0) -> AfficheLayout:
+    """Geometry only depends on these three values, so it is computed once per combination."""
+    film_rows = max(1, int(film_rows))
+    page_w = max(1, int(round(A4_W_PX * scale)))
+    page_h = max(1, int(round(A4_H_PX * scale)))
+
+    # P: fixed page pixels (at 300 DPI), S: ui-scaled sizes
+    P = lambda v: int(round(v * scale))
+    S = lambda v: max(1, int(round(v * ui_scale * scale)))
+
+    top_cols = top_cols_for_rows(film_rows)
+    bottom_cols = bottom_cols_for_rows(film_rows)
+
+    top_h = max(1, P(TOP_POSTERS_H))
+    bottom_min_ok = P(BOTTOM_MIN_OK)
+
+    header1_h = S(BASE_HEADER1_H_PX)
+    header2_h = S(BASE_HEADER2_H_PX)
+
+    row_h_target = S(BASE_ROW_H_TARGET)
+    row_h_min = S(BASE_ROW_H_MIN)
+
+    footer_h = S(BASE_FOOTER_H_PX)
+
+    bottom_h_target = int(top_h * BOTTOM_TARGET_MULT)
+
+    min_table_h = header1_h + header2_h + footer_h + film_rows * row_h_min
+    max_bottom_allowed = page_h - top_h - min_table_h
+    bottom_h = bottom_min_ok if max_bottom_allowed < bottom_min_ok else max(
+        bottom_min_ok, min(bottom_h_target, max_bottom_allowed)
+    )
+
+    available_for_table = page_h - top_h - bottom_h
+    row_h = min(
+        row_h_target,
+        max(row_h_min, (available_for_table - header1_h - header2_h - footer_h) // film_rows)
+    )
+
+    table_y0 = top_h
+    table_h = header1_h + header2_h + film_rows * row_h + footer_h
+    table_y1 = table_y0 + table_h
+
+    bottom_y0 = table_y1
+    bottom_h = page_h - bottom_y0
+
+    table_x0, table_x1 = 0, page_w
+    table_w = table_x1 - table_x0
+
+    film_w = int(table_w * 0.20)
+    duur_w = int(table_w * 0.05)
+    versie_w = int(table_w * 0.08)
+    good_w = int(table_w * 0.085)
+    day_total = table_w - film_w - duur_w - versie_w - good_w
+
+    rows_y0 = table_y0 + header1_h + header2_h
+    footer_y0 = rows_y0 + film_rows * row_h
+
+    return AfficheLayout(
+        scale=scale,
+        page_w=page_w,
+        page_h=page_h,
+        film_rows=film_rows,
+        top_cols=top_cols,
+        bottom_cols=bottom_cols,
+        top_h=top_h,
+        top_widths=_split_units(page_w, top_cols),
+        header1_h=header1_h,
+        header2_h=header2_h,
+        row_h=row_h,
+        footer_h=footer_h,
+        table_x0=table_x0,
+        table_x1=table_x1,
+        table_y0=table_y0,
+        table_y1=table_y1,
+        film_w=film_w,
+        duur_w=duur_w,
+        versie_w=versie_w,
+        good_w=good_w,
+        day_widths=_split_units(day_total, 14),
+        rows_y0=rows_y0,
+        footer_y0=footer_y0,
+        footer_y1=footer_y0 + footer_h,
+        bottom_y0=bottom_y0,
+        bottom_h=bottom_h,
+        bottom_row_hs=_split_units(bottom_h, 2) if bottom_h > 0 else (0, 0),
+        bottom_widths=_split_units(page_w, bottom_cols),
+    )
+
+
+# -----------------------------
+# Poster import (normalization)
+# -----------------------------
+def import_slot_cap(ui_scale: float = 1.0, title: bool = False) -> Tuple[int, int]:
+    """Largest poster (or title cell) size in px at 300 DPI over all row counts."""
+    max_w = max_h = 0
+    # column counts switch after 12 rows and the bottom band is tallest with few rows
+    for n in range(1, 14):
+        L = compute_layout(n, ui_scale, 1.0)
+        if title:
+            sizes = [(L.film_w, L.row_h)]
+        else:
+            sizes = [(b[2] - b[0], b[3] - b[1]) for b in (L.top_slot_box(i) for i in range(L.top_cols))]
+            if L.bottom_h > 0:
+                sizes += [(b[2] - b[0], b[3] - b[1]) for b in (L.bottom_slot_box(i) for i in range(2 * L.bottom_cols))]
+        for w, h in sizes:
+            max_w, max_h = max(max_w, w), max(max_h, h)
+    return max_w, max_h
+
+
+def _is_srgb_profile(icc: bytes) -> bool:
+    if ImageCms is None:
+        return True
+    try:
+        desc = ImageCms.getProfileDescription(ImageCms.ImageCmsProfile(io.BytesIO(icc)))
+        return "srgb" in (desc or "").lower()
+    except Exception:
+        return False
+
+
+def _to_srgb(im: Image.Image, keep_alpha: bool) -> Image.Image:
+    out_mode = "RGBA" if keep_alpha else "RGB"
+    icc = im.info.get("icc_profile")
+    if im.mode == "P":
+        im = im.convert("RGBA" if keep_alpha else "RGB")
+    if icc and ImageCms is not None and not _is_srgb_profile(icc):
+        try:
+            src_profile = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+            if keep_alpha and im.mode != "RGBA":
+                im = im.convert("RGBA")
+            return ImageCms.profileToProfile(im, src_profile, ImageCms.createProfile("sRGB"), outputMode=out_mode)
+        except Exception as e:
+            logging.warning(f"ICC conversion failed, plain convert: {e}")
+    return im.convert(out_mode)
+
+
+def normalize_import_image(path: str, slot_w: int, slot_h: int) -> ImageSourceLike:
+    """
+    Right-size an imported poster/title image once: sRGB, no larger than what covers
+    IMPORT_OVERSAMPLE x the slot, saved as optimized JPEG (WebP when it has alpha) in
+    NORMALIZED_DIR. The original file is left untouched; the returned source keeps
+    its file stem with the new extension, so the mime stored in MySQL matches the
+    bytes. Files that are already small sRGB JPEGs are used as-is.
+    """
+    cap_w = max(1, int(slot_w * IMPORT_OVERSAMPLE))
+    cap_h = max(1, int(slot_h * IMPORT_OVERSAMPLE))
+    name = os.path.basename(path)
+    try:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        out_base = NORMALIZED_DIR / f"{h.hexdigest()[:32]}_{cap_w}x{cap_h}"
+        for ext in (".jpg", ".webp"):
+            done = out_base.with_suffix(ext)
+            if done.is_file():
+                return ImageSource(name=Path(name).stem + ext, path=str(done))
+
+        with Image.open(path) as im:
+            icc = im.info.get("icc_profile")
+            srgb = not icc or _is_srgb_profile(icc)
+            has_alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+            # cover-fit of the cap box: enough pixels for both contain and cover slots
+            scale = max(cap_w / im.width, cap_h / im.height)
+            if scale >= 1.0 and im.format == "JPEG" and im.mode == "RGB" and srgb:
+                return path
+
+            size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+            if scale < 1.0 and im.format == "JPEG":
+                im.draft(im.mode, size)
+            out = _to_srgb(im, has_alpha)
+
+        if scale < 1.0 and out.size != size:
+            out = out.resize(size, Image.LANCZOS)
+
+        NORMALIZED_DIR.mkdir(parents=True, exist_ok=True)
+        ext = ".webp" if has_alpha else ".jpg"
+        target = out_base.with_suffix(ext)
+        tmp = target.with_name(target.name + ".part")
+        if has_alpha:
+            out.save(tmp, format="WEBP", quality=IMPORT_JPEG_QUALITY, method=4)
+        else:
+            out.save(tmp, format="JPEG", quality=IMPORT_JPEG_QUALITY, optimize=True, progressive=True)
+        os.replace(tmp, target)
+        return ImageSource(name=Path(name).stem + ext, path=str(target))
+    except Exception as e:
+        logging.warning(f"Image normalization failed for {path}: {e}")
+        return path
 
 
 # -----------------------------
@@ -510,13 +1423,41 @@ class AfficheRenderer:
         self.font_cell = load_modern_font(S(28))
 
         self._icons_cache: Dict[str, Image.Image] = {}
+        self._fitted_cache = FittedImageCache(POSTER_CACHE_MB)
+        self._fonts_by_scale: "OrderedDict[float, Tuple[ImageFont.ImageFont, ...]]" = OrderedDict({
+            1.0: (self.font_header, self.font_colhdr, self.font_colhdr_small, self.font_cell)
+        })
+        # caches are not thread-safe: preview worker and export_pdf serialize on this
+        self._lock = threading.RLock()
+        self._text_sprites: "OrderedDict[Tuple, Tuple[Image.Image, int, int, float]]" = OrderedDict()
+        # last rendered page per scale, patched in place on the next render
+        self._page_cache: "OrderedDict[float, Dict]" = OrderedDict()
+        # finished pages by (scale, state hash): an unchanged state is not rendered again.
+        # One LRU for all scales, so window resizes (a new scale each) cannot grow it.
+        self._page_memo: "OrderedDict[Tuple[float, str], Image.Image]" = OrderedDict()
+
+    def _fonts_for(self, scale: float) -> Tuple[ImageFont.ImageFont, ...]:
+        """(header, colhdr, colhdr_small, cell) fonts for a render scale (1.0 = 300 DPI)."""
+        key = round(scale, 4)
+        fonts = self._fonts_by_scale.get(key)
+        if fonts is None:
+            def S(x: int) -> int:
+                return max(1, int(round(x * self.ui_scale * key)))
+
+            fonts = (load_modern_font(S(52)), load_modern_font(S(30)),
+                     load_modern_font(S(26)), load_modern_font(S(28)))
+            self._fonts_by_scale[key] = fonts
+        self._fonts_by_scale.move_to_end(key)
+        # every resize is a new scale: keep 300 DPI plus the most recent few
+        while len(self._fonts_by_scale) > RENDER_SCALES_KEPT + 1:
+            oldest = next(k for k in self._fonts_by_scale if k != 1.0)
+            del self._fonts_by_scale[oldest]
+        return fonts
 
     @staticmethod
-    def _split_units(total: int, n: int) -> List[int]:
-        base = total // n
-        arr = [base] * n
-        arr[-1] += total - base * n
-        return arr
+    def scale_for_width(width_px: int) -> float:
+        """Render scale at which the page is width_px wide."""
+        return max(1, int(width_px)) / float(A4_W_PX)
 
     @staticmethod
     def _draw_cover(img: Image.Image, target_w: int, target_h: int) -> Image.Image:
@@ -534,50 +1475,38 @@ class AfficheRenderer:
         sw, sh = img.size
         scale = min(target_w / sw, target_h / sh)
         nw, nh = max(1, int(sw * scale)), max(1, int(sh * scale))
-        fg = img.resize((nw, nh), Image.LANCZOS)
+        fg = img if (nw, nh) == (sw, sh) else img.resize((nw, nh), Image.LANCZOS)
+        if (nw, nh) == (target_w, target_h):
+            return fg
 
         bg = Image.new("RGB", (target_w, target_h), (0, 0, 0))
         x_off = (target_w - nw) // 2
         y_off = (target_h - nh) // 2
+        right_w = target_w - (x_off + nw)
+        bot_h = target_h - (y_off + nh)
         bg.paste(fg, (x_off, y_off))
 
-        if nw < target_w:
-            left_w = x_off
-            right_w = target_w - (x_off + nw)
-            if left_w > 0:
-                left_strip = fg.crop((0, 0, 1, nh)).resize((left_w, nh), Image.LANCZOS)
-                bg.paste(left_strip, (0, y_off))
-            if right_w > 0:
-                right_strip = fg.crop((nw - 1, 0, nw, nh)).resize((right_w, nh), Image.LANCZOS)
-                bg.paste(right_strip, (x_off + nw, y_off))
-
-            if nh < target_h:
-                top_h = y_off
-                bot_h = target_h - (y_off + nh)
-                if top_h > 0:
-                    top_band = bg.crop((0, y_off, target_w, y_off + 1)).resize((target_w, top_h), Image.LANCZOS)
-                    bg.paste(top_band, (0, 0))
-                if bot_h > 0:
-                    bot_band = bg.crop((0, y_off + nh - 1, target_w, y_off + nh)).resize((target_w, bot_h), Image.LANCZOS)
-                    bg.paste(bot_band, (0, y_off + nh))
-        elif nh < target_h:
-            top_h = y_off
-            bot_h = target_h - (y_off + nh)
-            if top_h > 0:
-                top_strip = fg.crop((0, 0, nw, 1)).resize((nw, top_h), Image.LANCZOS)
-                bg.paste(top_strip, (x_off, 0))
-            if bot_h > 0:
-                bot_strip = fg.crop((0, nh - 1, nw, nh)).resize((nw, bot_h), Image.LANCZOS)
-                bg.paste(bot_strip, (x_off, y_off + nh))
-
-            if x_off > 0:
-                left_band = bg.crop((x_off, 0, x_off + 1, target_h)).resize((x_off, target_h), Image.LANCZOS)
-                bg.paste(left_band, (0, 0))
-            right_w = target_w - (x_off + nw)
-            if right_w > 0:
-                right_band = bg.crop((x_off + nw - 1, 0, x_off + nw, target_h)).resize((right_w, target_h), Image.LANCZOS)
-                bg.paste(right_band, (x_off + nw, 0))
-
+        # replicate the outer columns, then the outer rows (corners get the corner pixel);
+        # NEAREST on a 1-px strip is a plain copy, no resampling
+        if x_off > 0:
+            bg.paste(fg.crop((0, 0, 1, nh)).resize((x_off, nh), Image.NEAREST), (0, y_off))
+        if right_w > 0:
+            bg.paste(fg.crop((nw - 1, 0, nw, nh)).resize((right_w, nh), Image.NEAREST), (x_off + nw, y_off))
+        if y_off > 0:
+            bg.paste(bg.crop((0, y_off, target_w, y_off + 1)).resize((target_w, y_off), Image.NEAREST), (0, 0))
+        if bot_h > 0:
+            bg.paste(bg.crop((0, y_off + nh - 1, target_w, y_off + nh)).resize((target_w, bot_h), Image.NEAREST), (0, y_off + nh))
+
+        if EDGE_FILL_BLUR > 0:
+            margins = [
+                (0, 0, target_w, y_off),
+                (0, y_off + nh, target_w, target_h),
+                (0, y_off, x_off, y_off + nh),
+                (x_off + nw, y_off, target_w, y_off + nh),
+            ]
+            for box in margins:
+                if box[2] > box[0] and box[3] > box[1]:
+                    bg.paste(bg.crop(box).filter(ImageFilter.BoxBlur(EDGE_FILL_BLUR)), box[:2])
         return bg
 
     def _draw_poster_best_fit_top(self, img: Image.Image, w: int, h: int) -> Image.Image:
@@ -590,11 +1519,109 @@ class AfficheRenderer:
             return self._draw_cover(img, w, h)
         return self._draw_contain_edge_fill(img, w, h)
 
+    @staticmethod
+    def _decode_for_slot(src: Image.Image, w: int, h: int, mode: str) -> Image.Image:
+        """
+        Decode at the nearest power-of-two scale that is still >= what the slot needs
+        (JPEG: draft mode = DCT scaling while decoding; others: Image.reduce after load).
+        The final LANCZOS resample in _draw_* then works on a much smaller image.
+        """
+        sw, sh = src.size
+        if sw <= 0 or sh <= 0:
+            return src
+        if mode == FIT_CONTAIN_EDGE:
+            scale = min(w / sw, h / sh)
+        else:
+            # cover (and best-fit, which may fall back to cover) needs the larger scale
+            scale = max(w / sw, h / sh)
+        if scale >= 0.5:
+            return src
+        need_w = max(1, math.ceil(sw * scale))
+        need_h = max(1, math.ceil(sh * scale))
+
+        if src.format == "JPEG":
+            try:
+                src.draft(None, (need_w, need_h))
+                return src
+            except Exception:
+                pass
+
+        factor = 1
+        while sw // (factor * 2) >= need_w and sh // (factor * 2) >= need_h:
+            factor *= 2
+        if factor == 1:
+            return src
+        if src.mode not in _REDUCE_MODES:
+            # palette/bilevel/16-bit: reduce() rejects them (or would average palette indices)
+            has_alpha = "A" in src.mode or "transparency" in src.info
+            src = src.convert("RGBA" if has_alpha else "RGB")
+        try:
+            return src.reduce(factor)
+        except ValueError:
+            return src
+
+    @staticmethod
+    def _source_sig(src: ImageSourceLike) -> Optional[Tuple]:
+        """
+        Identity of a slot image: content hash when known, else (path, mtime, size).
+        None if the slot is empty or the file is gone.
+        """
+        s = as_image_source(src)
+        if s is None:
+            return None
+        if s.sha256 and (s.data is not None or s.mapped):
+            return ("sha256", s.sha256)
+        try:
+            st = os.stat(s.path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return s.path, st.st_mtime_ns, st.st_size
+
+    def _fitted_image(self, src: ImageSourceLike, w: int, h: int, mode: str) -> Optional[Image.Image]:
+        """Slot-sized poster/title image, cached on (source identity, w, h, mode). None if there is no image."""
+        sig = self._source_sig(src)
+        if sig is None:
+            return None
+
+        key = (sig, w, h, mode)
+        img = self._fitted_cache.get(key)
+        if img is not None:
+            return img
+
+        with as_image_source(src).open() as src:
+            src = self._decode_for_slot(src, w, h, mode)
+            if mode == FIT_BEST_TOP:
+                img = self._draw_poster_best_fit_top(src, w, h)
+            elif mode == FIT_CONTAIN_EDGE:
+                img = self._draw_contain_edge_fill(src, w, h)
+            else:
+                img = self._draw_cover(src, w, h)
+        self._fitted_cache.put(key, img)
+        return img
+
+    def _slot_image(self, src: ImageSourceLike, w: int, h: int, mode: str) -> Optional[Image.Image]:
+        """_fitted_image for a poster slot; an unreadable image leaves the slot empty instead of failing the page."""
+        try:
+            return self._fitted_image(src, w, h, mode)
+        except Exception as e:
+            logging.warning(f"Poster image skipped: {e}")
+            return None
+
     @staticmethod
     def _alpha_blit(dst_rgb: Image.Image, src_rgba: Image.Image, x: int, y: int):
-        tmp = dst_rgb.convert("RGBA")
-        tmp.alpha_composite(src_rgba, (x, y))
-        dst_rgb.paste(tmp.convert("RGB"))
+        """Alpha-composite an icon onto the RGB page; only the icon's bounding box is converted."""
+        x0, y0 = max(0, x), max(0, y)
+        x1 = min(dst_rgb.width, x + src_rgba.width)
+        y1 = min(dst_rgb.height, y + src_rgba.height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        if (x1 - x0, y1 - y0) != src_rgba.size:
+            src_rgba = src_rgba.crop((x0 - x, y0 - y, x1 - x, y1 - y))
+        region = dst_rgb.crop((x0, y0, x1, y1)).convert("RGBA")
+        region.alpha_composite(src_rgba)
+        dst_rgb.paste(region.convert("RGB"), (x0, y0))
 
     def _load_icon(self, filename: str, size_px: int) -> Optional[Image.Image]:
         """Goed gezien icons: PNG/JPG/WEBP only."""
@@ -636,77 +1663,217 @@ class AfficheRenderer:
         except Exception:
             return None
 
-    def render(self, state: AfficheState) -> Image.Image:
-        page = Image.new("RGB", (A4_W_PX, A4_H_PX), "white")
-        draw = ImageDraw.Draw(page)
-
-        film_rows = max(1, len(state.films))
-        top_cols = top_cols_for_rows(film_rows)
-        bottom_cols = bottom_cols_for_rows(film_rows)
-
-        top_h = TOP_POSTERS_H
-
-        S = lambda v: max(1, int(round(v * self.ui_scale)))
-
-        header1_h = S(BASE_HEADER1_H_PX)
-        header2_h = S(BASE_HEADER2_H_PX)
+    def render(self, state: AfficheState, scale: float = 1.0) -> Image.Image:
+        """
+        Render the affiche. scale=1.0 is the full 300 DPI page (PDF export);
+        the live preview passes a smaller scale and gets the same layout with
+        every pixel size and font scaled, instead of downsizing a full page.
+
+        The last page per scale is kept; when the layout is unchanged only the
+        regions whose content changed (poster slot, header, film row) are redrawn.
+        The last PAGE_MEMO_SIZE * RENDER_SCALES_KEPT finished pages are memoized
+        by (scale, state_hash()), so re-rendering an identical state only costs a copy.
+        """
+        with self._lock:
+            return self._render(state, scale)
+
+    def layout(self, film_rows: int, scale: float = 1.0) -> AfficheLayout:
+        return compute_layout(max(1, film_rows), self.ui_scale, scale)
+
+    # ---- change detection ----
+    def state_hash(self, state: AfficheState) -> str:
+        """
+        Stable SHA-256 of everything a render depends on. Images count by content
+        hash when known, else by (path, mtime, size), so an edited file changes it.
+        """
+        payload = {
+            "start_date": self._resolve_start_date(state).isoformat(),
+            "films": [{**vars(f), "title_image": self._source_sig(f.title_image)} for f in state.films],
+            "top": [self._source_sig(src) for src in state.posters.top],
+            "bottom": [self._source_sig(src) for src in state.posters.bottom],
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(blob).hexdigest()
 
-        row_h_target = S(BASE_ROW_H_TARGET)
-        row_h_min = S(BASE_ROW_H_MIN)
+    @staticmethod
+    def _resolve_start_date(state: AfficheState) -> dt.date:
+        try:
+            return parse_date_iso(state.start_date) if state.start_date else dt.date.today()
+        except Exception:
+            return dt.date.today()
+
+    def _content_sigs(self, state: AfficheState, start_date: dt.date, L: AfficheLayout) -> Dict:
+        top = state.posters.top
+        bottom = state.posters.bottom
+        n_bottom = 2 * L.bottom_cols if L.bottom_h > 0 else 0
+        return {
+            "header": start_date,
+            "top": [self._source_sig(top[i] if i < len(top) else "") for i in range(L.top_cols)],
+            "rows": [
+                (copy.deepcopy(f), self._source_sig(getattr(f, "title_image", "")))
+                for f in state.films[:L.film_rows]
+            ],
+            "bottom": [self._source_sig(bottom[i] if i < len(bottom) else "") for i in range(n_bottom)],
+        }
 
-        footer_h = S(BASE_FOOTER_H_PX)
+    @staticmethod
+    def _redraw_region(page: Image.Image, box: Tuple[int, int, int, int], margin: int, draw_fn):
+        """
+        Redraw one band in place. Outlines/lines may spill a few px over the
+        band edge, so the surrounding margin is restored afterwards: pixels
+        outside the band keep what the neighbouring bands drew.
+        """
+        x0, y0, x1, y1 = box
+        outer_box = (max(0, x0 - margin), max(0, y0 - margin),
+                     min(page.width, x1 + margin), min(page.height, y1 + margin))
+        outer = page.crop(outer_box)
+        draw_fn()
+        inner = page.crop(box)
+        page.paste(outer, outer_box[:2])
+        page.paste(inner, box[:2])
+
+    # ---- drawing ----
+    def _render(self, state: AfficheState, scale: float) -> Image.Image:
+        scale = float(scale) if scale and scale > 0 else 1.0
+        key = round(scale, 4)
+        film_rows = max(1, len(state.films))
 
-        bottom_h_target = int(top_h * BOTTOM_TARGET_MULT)
+        memo_key = (key, self.state_hash(state))
+        done = self._page_memo.get(memo_key)
+        if done is not None:
+            self._page_memo.move_to_end(memo_key)
+            return done.copy()
+
+        L = self.layout(film_rows, scale)
+        start_date = self._resolve_start_date(state)
+        sigs = self._content_sigs(state, start_date, L)
+        fonts = self._fonts_for(scale)
+
+        cached = self._page_cache.get(key)
+        if cached is None or cached["layout"] != L or len(sigs["rows"]) != film_rows:
+            page = Image.new("RGB", (L.page_w, L.page_h), "white")
+            self._draw_full(page, state, L, fonts, start_date)
+        else:
+            page = cached["page"]
+            old = cached["sigs"]
+            draw = ImageDraw.Draw(page)
+            margin = max(2, int(round(4 * scale)))
+
+            for i, sig in enumerate(sigs["top"]):
+                if sig != old["top"][i]:
+                    self._redraw_region(page, L.top_slot_box(i), margin,
+                                        lambda i=i: self._draw_top_slot(page, draw, state, L, i))
+            if sigs["header"] != old["header"]:
+                self._redraw_region(page, L.header_box(), margin,
+                                    lambda: self._draw_header(page, draw, L, fonts, start_date))
+            for r, sig in enumerate(sigs["rows"]):
+                if sig != old["rows"][r]:
+                    self._redraw_region(page, L.row_box(r), margin,
+                                        lambda r=r: self._draw_row(page, draw, state, L, fonts, r))
+            for idx, sig in enumerate(sigs["bottom"]):
+                if sig != old["bottom"][idx]:
+                    self._redraw_region(page, L.bottom_slot_box(idx), margin,
+                                        lambda idx=idx: self._draw_bottom_slot(page, draw, state, L, idx))
+
+        self._page_cache[key] = {"layout": L, "sigs": sigs, "page": page}
+        self._page_cache.move_to_end(key)
+        while len(self._page_cache) > RENDER_SCALES_KEPT:
+            self._page_cache.popitem(last=False)
+
+        # the cached page is patched in place by the next render
+        result = page.copy()
+        self._page_memo[memo_key] = result
+        while len(self._page_memo) > PAGE_MEMO_SIZE * RENDER_SCALES_KEPT:
+            self._page_memo.popitem(last=False)
+        return result.copy()
+
+    def _draw_full(self, page: Image.Image, state: AfficheState, L: AfficheLayout, fonts, start_date: dt.date):
+        draw = ImageDraw.Draw(page)
+        scale = L.scale
 
-        min_table_h = header1_h + header2_h + footer_h + film_rows * row_h_min
-        max_bottom_allowed = A4_H_PX - top_h - min_table_h
-        bottom_h = BOTTOM_MIN_OK if max_bottom_allowed < BOTTOM_MIN_OK else max(
-            BOTTOM_MIN_OK, min(bottom_h_target, max_bottom_allowed)
-        )
+        # TOP posters
+        for i in range(L.top_cols):
+            self._draw_top_slot(page, draw, state, L, i)
 
-        available_for_table = A4_H_PX - top_h - bottom_h
-        row_h = min(
-            row_h_target,
-            max(row_h_min, (available_for_table - header1_h - header2_h - footer_h) // film_rows)
-        )
+        draw.rectangle([L.table_x0, L.table_y0, L.table_x1, L.table_y1],
+                       outline=(120, 120, 120), width=max(1, int(round(3 * scale))))
 
-        table_y0 = top_h
-        table_h = header1_h + header2_h + film_rows * row_h + footer_h
-        table_y1 = table_y0 + table_h
+        self._draw_header(page, draw, L, fonts, start_date)
 
-        bottom_y0 = table_y1
-        bottom_h = A4_H_PX - bottom_y0
+        for r in range(L.film_rows):
+            self._draw_row(page, draw, state, L, fonts, r)
 
-        # TOP posters
-        col_widths = self._split_units(A4_W_PX, top_cols)
-        x = 0
-        for i in range(top_cols):
-            w = col_widths[i]
-            p = state.posters.top[i] if i < len(state.posters.top) else ""
-            if p and os.path.isfile(p):
-                img = Image.open(p)
-                page.paste(self._draw_poster_best_fit_top(img, w, top_h), (x, 0))
-            else:
-                draw.rectangle([x, 0, x + w, top_h], fill=(235, 235, 235))
-            x += w
+        self._draw_footer(page, draw, L, fonts)
 
-        # TABLE widths
-        table_x0, table_x1 = 0, A4_W_PX
-        table_w = table_x1 - table_x0
+        # BOTTOM posters: always full poster visible
+        if L.bottom_h > 0:
+            draw.rectangle([0, L.bottom_y0, L.page_w, L.page_h], fill=(240, 240, 240))
+            for idx in range(2 * L.bottom_cols):
+                self._draw_bottom_slot(page, draw, state, L, idx)
 
-        film_w = int(table_w * 0.20)
-        duur_w = int(table_w * 0.05)
-        versie_w = int(table_w * 0.08)
-        good_w = int(table_w * 0.085)
-        day_total = table_w - film_w - duur_w - versie_w - good_w
-        day_widths = self._split_units(day_total, 14)
+    @staticmethod
+    def _cell_outline(draw: ImageDraw.ImageDraw, x0, y0, x1, y1):
+        draw.rectangle([x0, y0, x1, y1], outline=(210, 210, 210), width=1)
+
+    def _text_sprite(self, text: str, font) -> Tuple[Image.Image, int, int, float]:
+        """
+        (alpha mask, dx, dy, advance) for one line of text, rasterized once per
+        (text, font file, size). Colour is applied when stamping, so one mask
+        serves every fill.
+        """
+        key = (text, getattr(font, "path", None) or id(font), getattr(font, "size", 0))
+        sprite = self._text_sprites.get(key)
+        if sprite is not None:
+            self._text_sprites.move_to_end(key)
+            return sprite
+
+        left, top, right, bottom = font.getbbox(text)
+        mask = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+        sprite = (mask, left, top, font.getlength(text))
+
+        self._text_sprites[key] = sprite
+        while len(self._text_sprites) > TEXT_SPRITE_CACHE_SIZE:
+            self._text_sprites.popitem(last=False)
+        return sprite
+
+    def _stamp_text(self, page: Image.Image, xy, text: str, font, fill):
+        mask, dx, dy, _adv = self._text_sprite(text, font)
+        x = int(round(xy[0])) + dx
+        y = int(round(xy[1])) + dy
+        page.paste(fill, (x, y, x + mask.width, y + mask.height), mask)
+
+    def _draw_center_text(self, page: Image.Image, scale: float, box, text, font, fill=(0, 0, 0), y_bias=0):
+        x0, y0, x1, y1 = box
+        lines = str(text).split("\n")
+        line_h = font.size + int(round(2 * scale))
+        total_h = line_h * len(lines)
+        yy = y0 + ((y1 - y0) - total_h) / 2 + y_bias * scale
+        for ln in lines:
+            ttw = self._text_sprite(ln, font)[3]
+            xx = x0 + ((x1 - x0) - ttw) / 2
+            self._stamp_text(page, (xx, yy), ln, font, fill)
+            yy += line_h
+
+    def _draw_top_slot(self, page: Image.Image, draw: ImageDraw.ImageDraw, state: AfficheState, L: AfficheLayout, i: int):
+        x, y0, x1, top_h = L.top_slot_box(i)
+        w = x1 - x
+        p = state.posters.top[i] if i < len(state.posters.top) else ""
+        fitted = self._slot_image(p, w, top_h, FIT_BEST_TOP)
+        if fitted is not None:
+            page.paste(fitted, (x, 0))
+        else:
+            draw.rectangle([x, 0, x + w, top_h], fill=(235, 235, 235))
 
-        draw.rectangle([table_x0, table_y0, table_x1, table_y1], outline=(120, 120, 120), width=3)
+    def _draw_header(self, page: Image.Image, draw: ImageDraw.ImageDraw, L: AfficheLayout, fonts, start_date: dt.date):
+        font_header, font_colhdr, font_colhdr_small, font_cell = fonts
+        scale = L.scale
+        P = lambda v: int(round(v * scale))
+        text = lambda box, t, font: self._draw_center_text(page, scale, box, t, font, y_bias=HEADER_TEXT_Y_BIAS)
 
-        try:
-            start_date = parse_date_iso(state.start_date) if state.start_date else dt.date.today()
-        except Exception:
-            start_date = dt.date.today()
+        table_x0, table_x1, table_w = L.table_x0, L.table_x1, L.table_w
+        table_y0, header1_h, header2_h = L.table_y0, L.header1_h, L.header2_h
+        film_w, duur_w, versie_w, good_w = L.film_w, L.duur_w, L.versie_w, L.good_w
 
         hdr = header_text(start_date)
         if not is_wednesday(start_date):
@@ -714,177 +1881,820 @@ class AfficheRenderer:
 
         # Header1 black + white
         draw.rectangle([table_x0, table_y0, table_x1, table_y0 + header1_h], fill=(0, 0, 0))
-        tw = draw.textlength(hdr, font=self.font_header)
+        tw = self._text_sprite(hdr, font_header)[3]
         tx = table_x0 + (table_w - tw) / 2
-        ty = table_y0 + (header1_h - self.font_header.size) / 2 + HEADER_TEXT_Y_BIAS
-        draw.text((tx, ty), hdr, fill=(255, 255, 255), font=self.font_header)
-
-        def cell_outline(x0, y0, x1, y1):
-            draw.rectangle([x0, y0, x1, y1], outline=(210, 210, 210), width=1)
-
-        def draw_center_text(box, text, font, fill=(0, 0, 0), y_bias=0):
-            x0, y0, x1, y1 = box
-            lines = str(text).split("\n")
-            line_h = font.size + 2
-            total_h = line_h * len(lines)
-            yy = y0 + ((y1 - y0) - total_h) / 2 + y_bias
-            for ln in lines:
-                ttw = draw.textlength(ln, font=font)
-                xx = x0 + ((x1 - x0) - ttw) / 2
-                draw.text((xx, yy), ln, fill=fill, font=font)
-                yy += line_h
+        ty = table_y0 + (header1_h - font_header.size) / 2 + HEADER_TEXT_Y_BIAS * scale
+        self._stamp_text(page, (tx, ty), hdr, font_header, (255, 255, 255))
 
         # Header2
         y_hdr2 = table_y0 + header1_h
-        draw.rectangle([table_x0, y_hdr2, table_x1, y_hdr2 + header2_h], fill=(250, 250, 250))
+        y_hdr2_end = y_hdr2 + header2_h
+        draw.rectangle([table_x0, y_hdr2, table_x1, y_hdr2_end], fill=(250, 250, 250))
 
         x = table_x0
 
         # FILM header: UI icon + text
-        cell_outline(x, y_hdr2, x + film_w, y_hdr2 + header2_h)
+        self._cell_outline(draw, x, y_hdr2, x + film_w, y_hdr2_end)
 
-        icon_size = max(18, min(42, header2_h - 18))
+        icon_size = max(1, max(P(18), min(P(42), header2_h - P(18))))
         icon_img = self._load_ui_icon("film.png", icon_size)
         if icon_img:
-            ix = x + 10
+            ix = x + P(10)
             iy = y_hdr2 + (header2_h - icon_size) // 2
             self._alpha_blit(page, icon_img, ix, iy)
 
-            text_x0 = x + 10 + icon_size + 10
-            draw_center_text((text_x0, y_hdr2, x + film_w, y_hdr2 + header2_h), "FILM", self.font_colhdr, y_bias=HEADER_TEXT_Y_BIAS)
+            text_x0 = x + P(10) + icon_size + P(10)
+            text((text_x0, y_hdr2, x + film_w, y_hdr2_end), "FILM", font_colhdr)
         else:
-            draw_center_text((x, y_hdr2, x + film_w, y_hdr2 + header2_h), "FILM", self.font_colhdr, y_bias=HEADER_TEXT_Y_BIAS)
+            text((x, y_hdr2, x + film_w, y_hdr2_end), "FILM", font_colhdr)
 
         x += film_w
 
-        cell_outline(x, y_hdr2, x + duur_w, y_hdr2 + header2_h)
-        draw_center_text((x, y_hdr2, x + duur_w, y_hdr2 + header2_h), "DUUR", self.font_colhdr_small, y_bias=HEADER_TEXT_Y_BIAS)
+        self._cell_outline(draw, x, y_hdr2, x + duur_w, y_hdr2_end)
+        text((x, y_hdr2, x + duur_w, y_hdr2_end), "DUUR", font_colhdr_small)
         x += duur_w
 
-        cell_outline(x, y_hdr2, x + versie_w, y_hdr2 + header2_h)
-        draw_center_text((x, y_hdr2, x + versie_w, y_hdr2 + header2_h), "VERSIE", self.font_colhdr, y_bias=HEADER_TEXT_Y_BIAS)
+        self._cell_outline(draw, x, y_hdr2, x + versie_w, y_hdr2_end)
+        text((x, y_hdr2, x + versie_w, y_hdr2_end), "VERSIE", font_colhdr)
         x += versie_w
 
-        cell_outline(x, y_hdr2, x + good_w, y_hdr2 + header2_h)
-        draw_center_text((x, y_hdr2, x + good_w, y_hdr2 + header2_h), "GOED\nGEZIEN", self.font_colhdr_small, y_bias=HEADER_TEXT_Y_BIAS)
+        self._cell_outline(draw, x, y_hdr2, x + good_w, y_hdr2_end)
+        text((x, y_hdr2, x + good_w, y_hdr2_end), "GOED\nGEZIEN", font_colhdr_small)
         x += good_w
 
         dates = two_week_dates_from_start(start_date)
         for i in range(14):
-            w = day_widths[i]
-            cell_outline(x, y_hdr2, x + w, y_hdr2 + header2_h)
-            draw_center_text((x, y_hdr2, x + w, y_hdr2 + header2_h), day_col_label(dates[i]), self.font_cell, y_bias=HEADER_TEXT_Y_BIAS)
+            w = L.day_widths[i]
+            self._cell_outline(draw, x, y_hdr2, x + w, y_hdr2_end)
+            text((x, y_hdr2, x + w, y_hdr2_end), day_col_label(dates[i]), font_cell)
+            x += w
+
+    def _draw_row(self, page: Image.Image, draw: ImageDraw.ImageDraw, state: AfficheState, L: AfficheLayout, fonts, r: int):
+        font_cell = fonts[3]
+        scale = L.scale
+        P = lambda v: int(round(v * scale))
+        film_w, duur_w, versie_w, good_w = L.film_w, L.duur_w, L.versie_w, L.good_w
+        row_h = L.row_h
+
+        table_x0, ry0, table_x1, ry1 = L.row_box(r)
+        fill_row = (245, 245, 245) if (r % 2 == 1) else (255, 255, 255)
+        draw.rectangle([table_x0, ry0, table_x1, ry1], fill=fill_row)
+
+        film = state.films[r]
+        txt_color = RED_3D if film.is_3d else (0, 0, 0)
+
+        def text(box, t):
+            self._draw_center_text(page, scale, box, t, font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
+
+        x = table_x0
+
+        # FILM cell: if title_image exists -> FULL cell image, and hide typed title
+        self._cell_outline(draw, x, ry0, x + film_w, ry1)
+        title_src = as_image_source(getattr(film, "title_image", ""))
+        if title_src is not None and title_src.exists():
+            try:
+                full_img = self._fitted_image(title_src, film_w, row_h, FIT_COVER)
+                page.paste(full_img, (x, ry0))
+            except Exception:
+                text((x, ry0, x + film_w, ry1), film.name)
+        else:
+            text((x, ry0, x + film_w, ry1), film.name)
+        x += film_w
+
+        # DUUR
+        self._cell_outline(draw, x, ry0, x + duur_w, ry1)
+        text((x, ry0, x + duur_w, ry1), film.duration)
+        x += duur_w
+
+        # VERSIE
+        self._cell_outline(draw, x, ry0, x + versie_w, ry1)
+        vtxt = film.version + (" 3D" if film.is_3d else "")
+        text((x, ry0, x + versie_w, ry1), vtxt)
+        x += versie_w
+
+        # GOED GEZIEN icons
+        self._cell_outline(draw, x, ry0, x + good_w, ry1)
+        if film.good_icons:
+            icon_size2 = max(1, max(P(20), min(P(30), row_h - P(14))))
+            ix = x + P(4)
+            iy = ry0 + (row_h - icon_size2) // 2
+            for icon_fn in film.good_icons[:4]:
+                icon_img2 = self._load_icon(icon_fn, icon_size2)
+                if icon_img2:
+                    self._alpha_blit(page, icon_img2, ix, iy)
+                    ix += icon_size2 + P(4)
+        x += good_w
+
+        # 14 day cells
+        for i in range(14):
+            w = L.day_widths[i]
+            self._cell_outline(draw, x, ry0, x + w, ry1)
+            t = (film.cells[i] or "").strip()
+            if t:
+                text((x, ry0, x + w, ry1), t)
             x += w
 
-        rows_y0 = table_y0 + header1_h + header2_h
+    def _draw_footer(self, page: Image.Image, draw: ImageDraw.ImageDraw, L: AfficheLayout, fonts):
+        # Footer row (full width under rows)
+        scale = L.scale
+        table_x0, table_x1 = L.table_x0, L.table_x1
+        footer_y0, footer_y1 = L.footer_y0, L.footer_y1
+        draw.rectangle([table_x0, footer_y0, table_x1, footer_y1], fill=(255, 255, 255))
+        draw.line([table_x0, footer_y0, table_x1, footer_y0], fill=(210, 210, 210), width=max(1, int(round(2 * scale))))
+        self._draw_center_text(page, scale, (table_x0, footer_y0, table_x1, footer_y1), FOOTER_TEXT, fonts[2], fill=(0, 0, 0), y_bias=0)
+
+    def _draw_bottom_slot(self, page: Image.Image, draw: ImageDraw.ImageDraw, state: AfficheState, L: AfficheLayout, idx: int):
+        x0, y0, x1, y1 = L.bottom_slot_box(idx)
+        draw.rectangle([x0, y0, x1 - 1, y1 - 1], fill=(240, 240, 240))
+        p = state.posters.bottom[idx] if idx < len(state.posters.bottom) else ""
+        fitted = self._slot_image(p, x1 - x0, y1 - y0, FIT_CONTAIN_EDGE)
+        if fitted is not None:
+            page.paste(fitted, (x0, y0))
+
+    def to_pdf_bytes(self, img: Image.Image, options: Optional[RasterPdfOptions] = None) -> bytes:
+        """
+        Raster PDF of a rendered page. The image is encoded once (JPEG or Flate at the
+        chosen level) and written straight into the PDF; pages rendered above
+        options.dpi are downsampled first.
+        """
+        options = options or RasterPdfOptions()
+        w_pt, h_pt = A4
+        return _image_pdf_bytes(*_encode_pdf_page(img, options), w_pt, h_pt)
+
+    # ---- vector PDF ----
+    _pdf_font_failed = False
+
+    @classmethod
+    def _pdf_font_name(cls) -> Optional[str]:
+        """
+        Register the affiche TTF with ReportLab once. None if that is not possible:
+        text is placed with the TTF's metrics, so another PDF font would misalign it.
+        """
+        if PDF_FONT_NAME in pdfmetrics.getRegisteredFontNames():
+            return PDF_FONT_NAME
+        if cls._pdf_font_failed:
+            return None
+        path = FONT_REGISTRY.font_path()
+        if path:
+            try:
+                pdfmetrics.registerFont(TTFont(PDF_FONT_NAME, path))
+                return PDF_FONT_NAME
+            except Exception as e:
+                logging.warning(f"PDF font registration failed ({path}): {e}")
+        else:
+            logging.warning("No TrueType affiche font found for the vector PDF")
+        cls._pdf_font_failed = True
+        return None
+
+    @staticmethod
+    def _pdf_image(img: Image.Image) -> ImageReader:
+        """Posters go in as JPEG (ReportLab embeds JPEG data as-is)."""
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=PDF_POSTER_JPEG_QUALITY, optimize=True)
+        buf.seek(0)
+        return ImageReader(buf)
+
+    def to_pdf_bytes_vector(self, state: AfficheState) -> bytes:
+        """
+        Same layout as render(), but table, text and lines are PDF vector operations.
+        Only posters, title images and icons are embedded, each at the size of its
+        slot at 300 DPI. Falls back to a 300 DPI raster PDF when the affiche font
+        cannot be embedded.
+        """
+        with self._lock:
+            if self._pdf_font_name() is None:
+                logging.warning("Vector PDF not possible without the affiche font, exporting raster PDF")
+                return self.to_pdf_bytes(self._render(state, 1.0))
+            return self._to_pdf_bytes_vector(state)
+
+    def _to_pdf_bytes_vector(self, state: AfficheState) -> bytes:
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf, pagesize=A4)
+        self._draw_vector_page(c, state)
+        c.save()
+        return buf.getvalue()
+
+    def to_pdf_vector_catalogue(self, states: Iterable[AfficheState], out) -> None:
+        """
+        Every state as one vector page of a single PDF; out is a path or binary file object.
+        Raster pages (300 DPI) when the affiche font cannot be embedded, as in to_pdf_bytes_vector.
+        """
+        with self._lock:
+            if self._pdf_font_name() is None:
+                logging.warning("Vector PDF not possible without the affiche font, exporting raster PDF")
+                w_pt, h_pt = A4
+                pages = (_encode_pdf_page(self._render(state, 1.0), RasterPdfOptions()) for state in states)
+                if isinstance(out, (str, os.PathLike)):
+                    with open(out, "wb") as f:
+                        _write_image_pdf(f, pages, w_pt, h_pt)
+                else:
+                    _write_image_pdf(out, pages, w_pt, h_pt)
+                return
+            c = canvas.Canvas(out, pagesize=A4)
+            for state in states:
+                self._draw_vector_page(c, state)
+            c.save()
+
+    def _draw_vector_page(self, c: canvas.Canvas, state: AfficheState):
+        w_pt, h_pt = A4
+        L = self.layout(max(1, len(state.films)), 1.0)
+        fx = w_pt / L.page_w
+        fy = h_pt / L.page_h
+        fonts = self._fonts_for(1.0)
+        pdf_font = self._pdf_font_name()
+        start_date = self._resolve_start_date(state)
+
+        def rgb(col):
+            return col[0] / 255.0, col[1] / 255.0, col[2] / 255.0
+
+        def rect(box, fill=None, stroke=None, line_px=1):
+            x0, y0, x1, y1 = box
+            if fill is not None:
+                c.setFillColorRGB(*rgb(fill))
+            if stroke is not None:
+                c.setStrokeColorRGB(*rgb(stroke))
+                c.setLineWidth(line_px * fx)
+            c.rect(x0 * fx, h_pt - y1 * fy, (x1 - x0) * fx, (y1 - y0) * fy,
+                   stroke=1 if stroke is not None else 0, fill=1 if fill is not None else 0)
+
+        def image(img: ImageReader, box):
+            x0, y0, x1, y1 = box
+            c.drawImage(img, x0 * fx, h_pt - y1 * fy, width=(x1 - x0) * fx, height=(y1 - y0) * fy,
+                        preserveAspectRatio=False, mask="auto")
+
+        def center_text(box, text, font, fill=(0, 0, 0), y_bias=0):
+            # same vertical metrics as _draw_center_text, baseline = top + ascent
+            x0, y0, x1, y1 = box
+            lines = str(text).split("\n")
+            line_h = font.size + 2
+            total_h = line_h * len(lines)
+            ascent = font.getmetrics()[0]
+            size_pt = font.size * fy
+            c.setFillColorRGB(*rgb(fill))
+            c.setFont(pdf_font, size_pt)
+            yy = y0 + ((y1 - y0) - total_h) / 2 + y_bias
+            for ln in lines:
+                tw = pdfmetrics.stringWidth(ln, pdf_font, size_pt)
+                xx = x0 * fx + ((x1 - x0) * fx - tw) / 2
+                c.drawString(xx, h_pt - (yy + ascent) * fy, ln)
+                yy += line_h
+
+        def icon(img: Optional[Image.Image], x, y, size):
+            if img is not None:
+                c.drawImage(ImageReader(img), x * fx, h_pt - (y + size) * fy,
+                            width=size * fx, height=size * fy, mask="auto")
+
+        font_header, font_colhdr, font_colhdr_small, font_cell = fonts
 
-        for r in range(film_rows):
-            ry0 = rows_y0 + r * row_h
-            ry1 = ry0 + row_h
-            fill_row = (245, 245, 245) if (r % 2 == 1) else (255, 255, 255)
-            draw.rectangle([table_x0, ry0, table_x1, ry1], fill=fill_row)
+        # TOP posters
+        for i in range(L.top_cols):
+            box = L.top_slot_box(i)
+            p = state.posters.top[i] if i < len(state.posters.top) else ""
+            fitted = self._slot_image(p, box[2] - box[0], box[3] - box[1], FIT_BEST_TOP)
+            if fitted is not None:
+                image(self._pdf_image(fitted), box)
+            else:
+                rect(box, fill=(235, 235, 235))
+
+        # Header1 black + white
+        hdr = header_text(start_date)
+        if not is_wednesday(start_date):
+            hdr += "  (start is geen woensdag)"
+        h1_box = (L.table_x0, L.table_y0, L.table_x1, L.table_y0 + L.header1_h)
+        rect(h1_box, fill=(0, 0, 0))
+        center_text(h1_box, hdr, font_header, fill=(255, 255, 255), y_bias=HEADER_TEXT_Y_BIAS)
+
+        # Header2
+        y_hdr2 = L.table_y0 + L.header1_h
+        y_hdr2_end = y_hdr2 + L.header2_h
+        rect((L.table_x0, y_hdr2, L.table_x1, y_hdr2_end), fill=(250, 250, 250))
+
+        x = L.table_x0
+        icon_size = max(18, min(42, L.header2_h - 18))
+        icon_img = self._load_ui_icon("film.png", icon_size * 2)
+        rect((x, y_hdr2, x + L.film_w, y_hdr2_end), stroke=(210, 210, 210))
+        if icon_img:
+            icon(icon_img, x + 10, y_hdr2 + (L.header2_h - icon_size) // 2, icon_size)
+            center_text((x + 10 + icon_size + 10, y_hdr2, x + L.film_w, y_hdr2_end), "FILM", font_colhdr,
+                        y_bias=HEADER_TEXT_Y_BIAS)
+        else:
+            center_text((x, y_hdr2, x + L.film_w, y_hdr2_end), "FILM", font_colhdr, y_bias=HEADER_TEXT_Y_BIAS)
+        x += L.film_w
+
+        dates = two_week_dates_from_start(start_date)
+        hdr2_cells = [(L.duur_w, "DUUR", font_colhdr_small), (L.versie_w, "VERSIE", font_colhdr),
+                      (L.good_w, "GOED\nGEZIEN", font_colhdr_small)]
+        hdr2_cells += [(L.day_widths[i], day_col_label(dates[i]), font_cell) for i in range(14)]
+        for w, label, font in hdr2_cells:
+            rect((x, y_hdr2, x + w, y_hdr2_end), stroke=(210, 210, 210))
+            center_text((x, y_hdr2, x + w, y_hdr2_end), label, font, y_bias=HEADER_TEXT_Y_BIAS)
+            x += w
+
+        # Film rows
+        for r in range(L.film_rows):
+            table_x0, ry0, table_x1, ry1 = L.row_box(r)
+            rect((table_x0, ry0, table_x1, ry1), fill=(245, 245, 245) if (r % 2 == 1) else (255, 255, 255))
 
             film = state.films[r]
             txt_color = RED_3D if film.is_3d else (0, 0, 0)
-
             x = table_x0
 
-            # FILM cell: if title_image exists -> FULL cell image, and hide typed title
-            cell_outline(x, ry0, x + film_w, ry1)
-            img_path = (getattr(film, "title_image", "") or "").strip()
-            if img_path and os.path.isfile(img_path):
+            title_img = None
+            title_src = as_image_source(getattr(film, "title_image", ""))
+            if title_src is not None and title_src.exists():
                 try:
-                    poster_like = Image.open(img_path)
-                    full_img = self._draw_cover(poster_like, film_w, row_h)
-                    page.paste(full_img, (x, ry0))
+                    title_img = self._fitted_image(title_src, L.film_w, L.row_h, FIT_COVER)
                 except Exception:
-                    draw_center_text((x, ry0, x + film_w, ry1), film.name, self.font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
+                    title_img = None
+            if title_img is not None:
+                image(self._pdf_image(title_img), (x, ry0, x + L.film_w, ry1))
             else:
-                draw_center_text((x, ry0, x + film_w, ry1), film.name, self.font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
-            x += film_w
-
-            # DUUR
-            cell_outline(x, ry0, x + duur_w, ry1)
-            draw_center_text((x, ry0, x + duur_w, ry1), film.duration, self.font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
-            x += duur_w
+                center_text((x, ry0, x + L.film_w, ry1), film.name, font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
+            rect((x, ry0, x + L.film_w, ry1), stroke=(210, 210, 210))
+            x += L.film_w
 
-            # VERSIE
-            cell_outline(x, ry0, x + versie_w, ry1)
             vtxt = film.version + (" 3D" if film.is_3d else "")
-            draw_center_text((x, ry0, x + versie_w, ry1), vtxt, self.font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
-            x += versie_w
+            for w, t in [(L.duur_w, film.duration), (L.versie_w, vtxt)]:
+                rect((x, ry0, x + w, ry1), stroke=(210, 210, 210))
+                center_text((x, ry0, x + w, ry1), t, font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
+                x += w
 
             # GOED GEZIEN icons
-            cell_outline(x, ry0, x + good_w, ry1)
+            rect((x, ry0, x + L.good_w, ry1), stroke=(210, 210, 210))
             if film.good_icons:
-                icon_size2 = max(20, min(30, row_h - 14))
+                icon_size2 = max(20, min(30, L.row_h - 14))
                 ix = x + 4
-                iy = ry0 + (row_h - icon_size2) // 2
+                iy = ry0 + (L.row_h - icon_size2) // 2
                 for icon_fn in film.good_icons[:4]:
-                    icon_img2 = self._load_icon(icon_fn, icon_size2)
+                    icon_img2 = self._load_icon(icon_fn, icon_size2 * 2)
                     if icon_img2:
-                        self._alpha_blit(page, icon_img2, ix, iy)
+                        icon(icon_img2, ix, iy, icon_size2)
                         ix += icon_size2 + 4
-            x += good_w
+            x += L.good_w
 
-            # 14 day cells
             for i in range(14):
-                w = day_widths[i]
-                cell_outline(x, ry0, x + w, ry1)
+                w = L.day_widths[i]
+                rect((x, ry0, x + w, ry1), stroke=(210, 210, 210))
                 t = (film.cells[i] or "").strip()
                 if t:
-                    draw_center_text((x, ry0, x + w, ry1), t, self.font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
+                    center_text((x, ry0, x + w, ry1), t, font_cell, fill=txt_color, y_bias=CELL_TEXT_Y_BIAS)
                 x += w
 
-        # Footer row (full width under rows)
-        footer_y0 = rows_y0 + film_rows * row_h
-        footer_y1 = footer_y0 + footer_h
-        draw.rectangle([table_x0, footer_y0, table_x1, footer_y1], fill=(255, 255, 255))
-        draw.line([table_x0, footer_y0, table_x1, footer_y0], fill=(210, 210, 210), width=2)
-        draw_center_text((table_x0, footer_y0, table_x1, footer_y1), FOOTER_TEXT, self.font_colhdr_small, fill=(0, 0, 0), y_bias=0)
+        # Footer row
+        rect(L.footer_box(), fill=(255, 255, 255))
+        c.setStrokeColorRGB(*rgb((210, 210, 210)))
+        c.setLineWidth(2 * fy)
+        c.line(L.table_x0 * fx, h_pt - L.footer_y0 * fy, L.table_x1 * fx, h_pt - L.footer_y0 * fy)
+        center_text(L.footer_box(), FOOTER_TEXT, font_colhdr_small)
+
+        # BOTTOM posters
+        if L.bottom_h > 0:
+            rect((0, L.bottom_y0, L.page_w, L.page_h), fill=(240, 240, 240))
+            for idx in range(2 * L.bottom_cols):
+                box = L.bottom_slot_box(idx)
+                p = state.posters.bottom[idx] if idx < len(state.posters.bottom) else ""
+                fitted = self._slot_image(p, box[2] - box[0], box[3] - box[1], FIT_CONTAIN_EDGE)
+                if fitted is not None:
+                    image(self._pdf_image(fitted), box)
 
-        # BOTTOM posters: always full poster visible
-        if bottom_h > 0:
-            draw.rectangle([0, bottom_y0, A4_W_PX, A4_H_PX], fill=(240, 240, 240))
-            slot_hs = self._split_units(bottom_h, 2)
-            row1_h, row2_h = slot_hs[0], slot_hs[1]
-            col_widths = self._split_units(A4_W_PX, bottom_cols)
-
-            x = 0
-            for c in range(bottom_cols):
-                w = col_widths[c]
-                p = state.posters.bottom[c] if c < len(state.posters.bottom) else ""
-                if p and os.path.isfile(p):
-                    img = Image.open(p)
-                    page.paste(self._draw_contain_edge_fill(img, w, row1_h), (x, bottom_y0))
-                x += w
+        c.showPage()
 
-            x = 0
-            y2 = bottom_y0 + row1_h
-            for c in range(bottom_cols):
-                w = col_widths[c]
-                idx = bottom_cols + c
-                p = state.posters.bottom[idx] if idx < len(state.posters.bottom) else ""
-                if p and os.path.isfile(p):
-                    img = Image.open(p)
-                    page.paste(self._draw_contain_edge_fill(img, w, row2_h), (x, y2))
-                x += w
 
-        return page
+# -----------------------------
+# Preview worker
+# -----------------------------
+class PreviewRenderWorker:
+    """
+    Renders previews on a background thread. Only the newest request matters:
+    submit() replaces a request that has not started yet, and results whose
+    generation is older than the latest submitted one are dropped.
+    Never touches Tk; the App polls take_result() from the Tk thread.
+    """
 
-    def to_pdf_bytes(self, img: Image.Image) -> bytes:
-        buf = io.BytesIO()
-        w_pt, h_pt = A4
-        c = canvas.Canvas(buf, pagesize=(w_pt, h_pt))
+    def __init__(self, renderer: AfficheRenderer):
+        self.renderer = renderer
+        self._cond = threading.Condition()
+        self._pending: Optional[Tuple[int, AfficheState, float]] = None
+        self._result: Optional[Tuple[int, Optional[Image.Image]]] = None
+        self._latest_gen = 0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, gen: int, state: AfficheState, scale: float):
+        """state must be a snapshot the caller no longer mutates."""
+        with self._cond:
+            if self._stopped:
+                return
+            self._latest_gen = gen
+            self._pending = (gen, state, scale)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="affiche-preview", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def take_result(self) -> Optional[Tuple[int, Optional[Image.Image]]]:
+        """(gen, image) of the newest finished render, or None. image is None if rendering failed."""
+        with self._cond:
+            res, self._result = self._result, None
+            return res
+
+    def stop(self):
+        """End the thread (after a render in progress); further submits are ignored."""
+        with self._cond:
+            self._stopped = True
+            self._pending = None
+            self._result = None
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                gen, state, scale = self._pending
+                self._pending = None
 
-        img_buf = io.BytesIO()
-        img.save(img_buf, format="PNG")
-        img_buf.seek(0)
+            try:
+                img = self.renderer.render(state, scale=scale)
+            except Exception:
+                logging.exception("Preview render failed")
+                img = None
 
-        c.drawImage(ImageReader(img_buf), 0, 0, width=w_pt, height=h_pt, preserveAspectRatio=False, mask="auto")
-        c.showPage()
-        c.save()
-        return buf.getvalue()
+            with self._cond:
+                if gen == self._latest_gen and not self._stopped:
+                    self._result = (gen, img)
+
+
+# -----------------------------
+# Batch export (UI + CLI)
+# -----------------------------
+def affiche_state_from_json(state_json: str, start_date: dt.date) -> AfficheState:
+    """AfficheState from a stored state_json; image slots stay empty (they live in affiche_images)."""
+    obj = json.loads(state_json)
+    films = []
+    for fobj in obj.get("films", []):
+        cells = fobj.get("cells", [""] * 14)
+        if len(cells) < 14:
+            cells = (cells + [""] * 14)[:14]
+
+        films.append(FilmRow(
+            name=fobj.get("name", "NAAM"),
+            duration=fobj.get("duration", ""),
+            version=fobj.get("version", "OV"),
+            is_3d=bool(fobj.get("is_3d", False)),
+            good_icons=list(fobj.get("good_icons", [])),
+            title_image="",
+            cells=list(cells),
+        ))
+    if not films:
+        films = [FilmRow()]
+    return AfficheState(start_date=obj.get("start_date", start_date.isoformat()), films=films)
+
+
+def image_source_for_ref(store: MySQLStore, start_date: dt.date, ref: AfficheImageRef,
+                         connect: Callable[[], object]) -> Optional[ImageSource]:
+    """
+    Image for one stored slot: from IMAGE_CACHE when present, else fetched and cached.
+    connect() is only called on a cache miss. None if the DB has no data for the slot.
+    """
+    cached = IMAGE_CACHE.get(ref.sha256, ref.filename, ref.size_bytes)
+    if cached:
+        return ImageSource.from_cache_file(cached, ref.filename, ref.sha256)
+
+    blob = store.fetch_image_blob(start_date, ref, cn=connect())
+    if not blob:
+        return None
+    src = ImageSource.from_bytes(blob, ref.filename, ref.sha256)
+    try:
+        # mapped cache file keeps the blob out of the Python heap
+        cached = IMAGE_CACHE.put(src.sha256, blob, ref.filename)
+        return ImageSource.from_cache_file(cached, ref.filename, src.sha256)
+    except Exception as e:
+        logging.warning(f"Image cache write failed, keeping blob in memory: {e}")
+        return src
+
+
+def load_affiche_state(store: MySQLStore, start_date: dt.date) -> AfficheState:
+    """A stored affiche with every image slot filled, ready to render."""
+    state_json, refs = store.load_affiche_meta(start_date)
+    state = affiche_state_from_json(state_json, start_date)
+
+    cn = None
+
+    def connect():
+        nonlocal cn
+        if cn is None:
+            cn = store.connect()
+        return cn
+
+    try:
+        for ref in refs:
+            try:
+                src = image_source_for_ref(store, start_date, ref, connect)
+            except Exception as e:
+                logging.exception(f"MySQL image load failed ({start_date} {ref.slot_type} {ref.slot_index}): {e}")
+                continue
+            if src is None:
+                continue
+            idx = ref.slot_index
+            if ref.slot_type == "top" and 0 <= idx < MAX_TOP:
+                state.posters.top[idx] = src
+            elif ref.slot_type == "bottom" and 0 <= idx < MAX_BOTTOM:
+                state.posters.bottom[idx] = src
+            elif ref.slot_type == "title" and 0 <= idx < len(state.films):
+                state.films[idx].title_image = src
+    finally:
+        if cn is not None:
+            try:
+                cn.close()
+            except Exception:
+                pass
+    return state
+
+
+# one renderer per pool process: fonts, icons and fitted posters carry over between periods
+_BATCH_RENDERER: Optional[AfficheRenderer] = None
+
+
+def _batch_worker_init(ui_scale: float):
+    global _BATCH_RENDERER
+    _BATCH_RENDERER = AfficheRenderer(ICONS_DIR, ui_scale=ui_scale)
+
+
+def _batch_render(state: AfficheState, options: Optional[RasterPdfOptions], as_pdf: bool):
+    """One period: PDF bytes, or (as_pdf=False, raster only) an encoded page for _write_image_pdf."""
+    renderer = _BATCH_RENDERER
+    if options is None:
+        return renderer.to_pdf_bytes_vector(state)
+    img = renderer.render(state, scale=min(1.0, options.dpi / DPI))
+    if as_pdf:
+        return renderer.to_pdf_bytes(img, options)
+    return _encode_pdf_page(img, options)
+
+
+@contextmanager
+def _batch_map(workers: int, ui_scale: float):
+    """map() over a process pool, or in this process when a single worker is enough."""
+    if workers <= 1:
+        _batch_worker_init(ui_scale)
+        yield map
+        return
+    # spawn: never fork a process that runs Tk and worker threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_batch_worker_init, initargs=(ui_scale,)) as pool:
+        yield pool.map
+
+
+def batch_export_affiches(
+    store: MySQLStore,
+    start: dt.date,
+    end: dt.date,
+    out_path: str,
+    options: Optional[RasterPdfOptions] = None,
+    combined: bool = False,
+    ui_scale: float = 1.0,
+    workers: int = 0,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+) -> List[str]:
+    """
+    Export every stored affiche with a start date in [start, end].
+    combined=False: one PDF per period in the directory out_path (affiche_<datum>.pdf);
+    combined=True: one catalogue PDF at out_path with a page per period.
+    options=None is the vector backend, else a raster preset.
+
+    Periods are loaded lazily, one after another: images go into the shared on-disk
+    IMAGE_CACHE and each loaded period is handed to a pool of processes right away
+    (workers=0: one per core, minus one), so rendering overlaps with the DB fetches.
+    A combined vector catalogue is drawn on a single ReportLab canvas in this process.
+    progress(stage, done, total) is called per period with stage "load" and "page".
+    Returns the written paths.
+    """
+    dates = store.list_affiches(start, end)
+    if not dates:
+        return []
+    total = len(dates)
+
+    def report(stage: str, done: int):
+        if progress is not None:
+            progress(stage, done, total)
+
+    def states():
+        for i, d in enumerate(dates, start=1):
+            state = load_affiche_state(store, d)
+            report("load", i)
+            yield state
+
+    if combined and options is None:
+        renderer = AfficheRenderer(ICONS_DIR, ui_scale=ui_scale)
+
+        def counted():
+            for i, state in enumerate(states(), start=1):
+                yield state
+                report("page", i)
+
+        renderer.to_pdf_vector_catalogue(counted(), out_path)
+        return [out_path]
+
+    n_workers = workers if workers > 0 else max(1, min(total, (os.cpu_count() or 2) - 1))
+    written: List[str] = []
+    with _batch_map(n_workers, ui_scale) as run:
+        # map() submits while it consumes states(): workers start on the first period early
+        results = run(_batch_render, states(), [options] * total, [not combined] * total)
+        if combined:
+            def pages():
+                for i, page in enumerate(results, start=1):
+                    yield page
+                    report("page", i)
+
+            w_pt, h_pt = A4
+            with open(out_path, "wb") as f:
+                _write_image_pdf(f, pages(), w_pt, h_pt)
+            written.append(out_path)
+        else:
+            os.makedirs(out_path, exist_ok=True)
+            for i, (d, pdf_bytes) in enumerate(zip(dates, results), start=1):
+                path = os.path.join(out_path, f"affiche_{d.isoformat()}.pdf")
+                with open(path, "wb") as f:
+                    f.write(pdf_bytes)
+                written.append(path)
+                report("page", i)
+    return written
+
+
+class BatchExportDialog(tk.Toplevel):
+    """Van/Tot + per periode of catalogus; exports on a worker thread, progress polled with after()."""
+
+    def __init__(self, app: "App"):
+        super().__init__(app)
+        self.app = app
+        self.title("Batch export affiches")
+        self.resizable(False, False)
+        self.transient(app.winfo_toplevel())
+
+        self._queue: "queue.Queue[Tuple]" = queue.Queue()
+        self._running = False
+
+        try:
+            start = parse_date_iso(app.start_var.get().strip())
+        except Exception:
+            start = dt.date.today()
+        self.from_var = tk.StringVar(value=start.isoformat())
+        self.to_var = tk.StringVar(value=(start + dt.timedelta(weeks=26)).isoformat())
+        self.combined_var = tk.BooleanVar(value=False)
+        self.status_var = tk.StringVar(value=f"Formaat: {app.pdf_preset_var.get()}")
+
+        frm = ttk.Frame(self, padding=12)
+        frm.pack(fill="both", expand=True)
+
+        ttk.Label(frm, text="Van (YYYY-MM-DD):").grid(row=0, column=0, sticky="w")
+        ttk.Entry(frm, textvariable=self.from_var, width=12).grid(row=0, column=1, sticky="w", padx=6)
+        ttk.Label(frm, text="Tot (YYYY-MM-DD):").grid(row=1, column=0, sticky="w", pady=(6, 0))
+        ttk.Entry(frm, textvariable=self.to_var, width=12).grid(row=1, column=1, sticky="w", padx=6, pady=(6, 0))
+
+        ttk.Radiobutton(frm, text="Eén PDF per periode (map)", variable=self.combined_var, value=False).grid(
+            row=2, column=0, columnspan=2, sticky="w", pady=(10, 0)
+        )
+        ttk.Radiobutton(frm, text="Eén catalogus-PDF (alle periodes)", variable=self.combined_var, value=True).grid(
+            row=3, column=0, columnspan=2, sticky="w"
+        )
+        ttk.Label(frm, textvariable=self.status_var).grid(row=4, column=0, columnspan=2, sticky="w", pady=(10, 0))
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=5, column=0, columnspan=2, sticky="e", pady=(10, 0))
+        ttk.Button(btns, text="Sluiten", command=self._close).pack(side="right")
+        self.btn_start = ttk.Button(btns, text="Exporteer", command=self._start)
+        self.btn_start.pack(side="right", padx=(0, 8))
+
+        self.bind("<Escape>", lambda e: self._close())
+        self.protocol("WM_DELETE_WINDOW", self._close)
+
+    def _start(self):
+        try:
+            start = parse_date_iso(self.from_var.get().strip())
+            end = parse_date_iso(self.to_var.get().strip())
+        except Exception:
+            messagebox.showerror("Datum", "Ongeldige datum. Gebruik YYYY-MM-DD.", parent=self)
+            return
+        if end < start:
+            messagebox.showerror("Datum", "‘Tot’ mag niet vóór ‘Van’ liggen.", parent=self)
+            return
+
+        combined = bool(self.combined_var.get())
+        if combined:
+            out = filedialog.asksaveasfilename(
+                title="Bewaar catalogus",
+                defaultextension=".pdf",
+                initialfile=f"affiches_{start.isoformat()}_{end.isoformat()}.pdf",
+                filetypes=[("PDF", "*.pdf")],
+                parent=self,
+            )
+        else:
+            out = filedialog.askdirectory(title="Kies map voor affiches", parent=self)
+        if not out:
+            return
+
+        options = PDF_EXPORT_PRESETS.get(self.app.pdf_preset_var.get())
+        store = self.app.db_store
+        ui_scale = self.app.renderer.ui_scale
+
+        def worker():
+            try:
+                written = batch_export_affiches(
+                    store, start, end, out, options=options, combined=combined, ui_scale=ui_scale,
+                    progress=lambda stage, done, total: self._queue.put(("progress", stage, done, total)),
+                )
+                self._queue.put(("done", written))
+            except Exception as e:
+                logging.exception(f"Batch export failed: {e}")
+                self._queue.put(("error", str(e)))
+
+        self._running = True
+        self.btn_start.configure(state="disabled")
+        self.status_var.set("Affiches opzoeken…")
+        threading.Thread(target=worker, name="affiche-batch-export", daemon=True).start()
+        self.after(200, self._poll)
+
+    def _poll(self):
+        if not self.winfo_exists():
+            return   # closed while the export was still running
+        while True:
+            try:
+                msg = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if msg[0] == "progress":
+                _kind, stage, done, total = msg
+                label = "Laden uit DataBase" if stage == "load" else "Pagina"
+                self.status_var.set(f"{label} {done} van {total}…")
+            elif msg[0] == "done":
+                self._finish()
+                written = msg[1]
+                if not written:
+                    self.status_var.set("Geen affiches in deze periode.")
+                    messagebox.showinfo("Info", "Geen affiches in deze periode.", parent=self)
+                else:
+                    target = written[0] if len(written) == 1 else os.path.dirname(written[0])
+                    self.status_var.set(f"{len(written)} PDF(s) opgeslagen.")
+                    messagebox.showinfo("OK", f"{len(written)} PDF(s) opgeslagen:\n{target}", parent=self)
+                return
+            elif msg[0] == "error":
+                self._finish()
+                self.status_var.set("Export mislukt.")
+                messagebox.showerror("Batch export", f"Export mislukt:\n{msg[1]}", parent=self)
+                return
+        self.after(200, self._poll)
+
+    def _finish(self):
+        self._running = False
+        self.btn_start.configure(state="normal")
+
+    def _close(self):
+        if self._running and not messagebox.askyesno(
+            "Batch export", "De export loopt nog op de achtergrond. Venster toch sluiten?", parent=self
+        ):
+            return
+        self.destroy()
+
+
+def batch_export_main(argv: Optional[List[str]] = None) -> int:
+    """Headless: python cinema_affiche.py --batch-export VAN TOT --out PAD [--combined] [--preset NAAM]"""
+    parser = argparse.ArgumentParser(prog="cinema_affiche", description="Exporteer opgeslagen affiches als PDF.")
+    parser.add_argument("--batch-export", nargs=2, metavar=("VAN", "TOT"), required=True,
+                        help="startdata YYYY-MM-DD (grenzen inbegrepen)")
+    parser.add_argument("--out", required=True, help="map (één PDF per periode) of bestand (met --combined)")
+    parser.add_argument("--combined", action="store_true", help="één catalogus-PDF met een pagina per periode")
+    parser.add_argument("--preset", default="Vector (drukwerk)", choices=list(PDF_EXPORT_PRESETS))
+    parser.add_argument("--workers", type=int, default=0, help="aantal processen (0 = automatisch)")
+    parser.add_argument("--ui-scale", type=float, default=1.0, help="schaal van de affiche-layout (zoals in de app)")
+    args = parser.parse_args(argv)
+
+    try:
+        start, end = (parse_date_iso(x) for x in args.batch_export)
+    except ValueError:
+        parser.error("ongeldige datum, gebruik YYYY-MM-DD")
+    if not mysql_connector_available:
+        print("mysql-connector-python is niet geïnstalleerd.", file=sys.stderr)
+        return 2
+
+    try:
+        written = batch_export_affiches(
+            MySQLStore(get_mysql_config()), start, end, args.out,
+            options=PDF_EXPORT_PRESETS[args.preset], combined=args.combined,
+            ui_scale=args.ui_scale, workers=args.workers,
+            progress=lambda stage, done, total: print(f"{stage} {done}/{total}", file=sys.stderr),
+        )
+    except Exception as e:
+        logging.exception(f"Batch export failed: {e}")
+        print(f"Export mislukt: {e}", file=sys.stderr)
+        return 1
+
+    if not written:
+        print("Geen affiches in deze periode.", file=sys.stderr)
+    for path in written:
+        print(path)
+    return 0
 
 
 # -----------------------------
@@ -913,6 +2723,15 @@ class App(ttk.Frame):
 
         self.preview_imgtk = None
         self._preview_after_id = None
+        self._preview_worker = PreviewRenderWorker(self.renderer)
+        self._preview_gen = 0
+        self._preview_poll_id = None
+
+        # background blob loading after load_from_mysql
+        self._db_load_gen = 0
+        self._db_image_queue: "queue.Queue[Tuple[int, Optional[AfficheImageRef], Optional[ImageSource]]]" = queue.Queue()
+        self._db_image_poll_id = None
+        self._db_images_loading = False   # Save is blocked until the stored images are all in
 
         self.current_row_index = 0
         self.is_loading_row = False
@@ -1000,6 +2819,11 @@ class App(ttk.Frame):
 
         ttk.Button(ctrl, text="↻ Preview", command=self._schedule_preview).pack(side="left", padx=6)
         ttk.Button(ctrl, text="Exporteer PDF…", command=self.export_pdf).pack(side="right")
+        presets = list(PDF_EXPORT_PRESETS)
+        self.pdf_preset_var = tk.StringVar(value=presets[1] if PDF_BACKEND == "raster" else presets[0])
+        ttk.Combobox(ctrl, textvariable=self.pdf_preset_var, values=presets, state="readonly", width=30).pack(
+            side="right", padx=6
+        )
 
         # DB buttons
         db_bar = ttk.Frame(left)
@@ -1007,12 +2831,15 @@ class App(ttk.Frame):
 
         self.btn_db_save = ttk.Button(db_bar, text="💾 Opslaan in DataBase", command=self.save_to_mysql)
         self.btn_db_load = ttk.Button(db_bar, text="📂 Open uit DataBase", command=self.load_from_mysql)
+        self.btn_db_batch = ttk.Button(db_bar, text="📚 Batch export…", command=self.batch_export)
         self.btn_db_save.pack(side="left")
         self.btn_db_load.pack(side="left", padx=8)
+        self.btn_db_batch.pack(side="left")
 
         if not self.db_store:
             self.btn_db_save.configure(state="disabled")
             self.btn_db_load.configure(state="disabled")
+            self.btn_db_batch.configure(state="disabled")
 
         posters_frame = ttk.LabelFrame(left, text="Posters", padding=8)
         posters_frame.pack(fill="x", pady=(0, 8))
@@ -1123,7 +2950,7 @@ class App(ttk.Frame):
         for cv in self.cell_vars:
             cv.trace_add("write", lambda *_: self._schedule_preview())
 
-        self._cleanup_tmp_db_images()
+        _remove_legacy_tmp_dir()
 
     def _build_schedule_widgets_once(self):
         for i in range(14):
@@ -1170,7 +2997,7 @@ class App(ttk.Frame):
             v = f.version + (" 3D" if f.is_3d else "")
             dur = f.duration.strip()
             dur_show = f" {dur}" if dur else ""
-            has_img = bool((getattr(f, "title_image", "") or "").strip())
+            has_img = as_image_source(getattr(f, "title_image", "")) is not None
             img_tag = " [IMG]" if has_img else ""
             self.film_list.insert(tk.END, f"{i+1:02d}. {f.name}{dur_show} [{v}]{img_tag}")
 
@@ -1236,7 +3063,7 @@ class App(ttk.Frame):
             self.version_var.set(f.version)
             self.is3d_var.set(f.is_3d)
 
-            base = os.path.basename(getattr(f, "title_image", "") or "")
+            base = image_source_name(getattr(f, "title_image", ""))
             self.title_image_var.set(base)
 
             for fn, var in self.icon_vars.items():
@@ -1320,10 +3147,11 @@ class App(ttk.Frame):
         if not path:
             return
 
+        src = normalize_import_image(path, *import_slot_cap(self.renderer.ui_scale))
         if where == "top":
-            self.state_obj.posters.top[index] = path
+            self.state_obj.posters.top[index] = src
         else:
-            self.state_obj.posters.bottom[index] = path
+            self.state_obj.posters.bottom[index] = src
         self._schedule_preview()
 
     def import_title_image(self):
@@ -1336,8 +3164,9 @@ class App(ttk.Frame):
 
         idx = self.current_row_index
         if 0 <= idx < len(self.state_obj.films):
-            self.state_obj.films[idx].title_image = path
-            self.title_image_var.set(os.path.basename(path))
+            src = normalize_import_image(path, *import_slot_cap(self.renderer.ui_scale, title=True))
+            self.state_obj.films[idx].title_image = src
+            self.title_image_var.set(image_source_name(src))
 
         self._refresh_film_list()
         self._schedule_preview()
@@ -1358,21 +3187,39 @@ class App(ttk.Frame):
         self._preview_after_id = self.after(150, self._update_preview)
 
     def _update_preview(self):
-        img = self.renderer.render(self.state_obj)
-
         avail = self.preview_label.winfo_width()
         if avail < 200:
             avail = 700
-        scale = (avail - 20) / img.size[0]
-        prev = img.resize((int(img.size[0] * scale), int(img.size[1] * scale)), Image.LANCZOS)
+        # Render straight at label size; full DPI is only used for export_pdf
+        scale = AfficheRenderer.scale_for_width(avail - 20)
 
-        self.preview_imgtk = ImageTk.PhotoImage(prev)
-        self.preview_label.configure(image=self.preview_imgtk)
+        self._preview_after_id = None
+        self._preview_gen += 1
+        self._preview_worker.submit(self._preview_gen, copy.deepcopy(self.state_obj), scale)
+        if self._preview_poll_id is None:
+            self._preview_poll_id = self.after(15, self._poll_preview)
+
+    def _poll_preview(self):
+        self._preview_poll_id = None
+        res = self._preview_worker.take_result()
+        if res is not None:
+            gen, prev = res
+            if prev is not None and gen == self._preview_gen:
+                self.preview_imgtk = ImageTk.PhotoImage(prev)
+                self.preview_label.configure(image=self.preview_imgtk)
+            if gen == self._preview_gen:
+                return
+        self._preview_poll_id = self.after(15, self._poll_preview)
 
     def export_pdf(self):
         self._save_editor_into_row(self.current_row_index)
-        img = self.renderer.render(self.state_obj)
-        pdf_bytes = self.renderer.to_pdf_bytes(img)
+        options = PDF_EXPORT_PRESETS.get(self.pdf_preset_var.get())
+        if options is not None:
+            # render at the export DPI directly instead of downsampling a 300 DPI page
+            img = self.renderer.render(self.state_obj, scale=min(1.0, options.dpi / DPI))
+            pdf_bytes = self.renderer.to_pdf_bytes(img, options)
+        else:
+            pdf_bytes = self.renderer.to_pdf_bytes_vector(self.state_obj)
 
         out = filedialog.asksaveasfilename(
             title="Bewaar PDF",
@@ -1385,6 +3232,12 @@ class App(ttk.Frame):
             f.write(pdf_bytes)
         messagebox.showinfo("OK", f"PDF opgeslagen:\n{out}")
 
+    def batch_export(self):
+        if not self.db_store:
+            messagebox.showerror("MySQL", "MySQL is niet beschikbaar. Installeer mysql-connector-python en zet env vars.")
+            return
+        BatchExportDialog(self)
+
     def _serialize_state_json(self) -> str:
         self._save_editor_into_row(self.current_row_index)
         try:
@@ -1397,13 +3250,13 @@ class App(ttk.Frame):
             "films": [
                 {
                     **asdict(f),
-                    "title_image": os.path.basename(f.title_image) if f.title_image else ""
+                    "title_image": image_source_name(f.title_image)
                 }
                 for f in self.state_obj.films
             ],
             "posters": {
-                "top": [os.path.basename(p) if p else "" for p in self.state_obj.posters.top],
-                "bottom": [os.path.basename(p) if p else "" for p in self.state_obj.posters.bottom],
+                "top": [image_source_name(p) for p in self.state_obj.posters.top],
+                "bottom": [image_source_name(p) for p in self.state_obj.posters.bottom],
             }
         }
         return json.dumps(obj, ensure_ascii=False)
@@ -1413,6 +3266,10 @@ class App(ttk.Frame):
             messagebox.showerror("MySQL", "MySQL is niet beschikbaar. Installeer mysql-connector-python en zet env vars.")
             return
 
+        if self._db_images_loading:
+            messagebox.showinfo("MySQL", "De afbeeldingen van de geopende affiche worden nog geladen. Probeer zo dadelijk opnieuw.")
+            return
+
         try:
             d = parse_date_iso(self.start_var.get().strip())
         except Exception:
@@ -1430,8 +3287,8 @@ class App(ttk.Frame):
 
         title_paths = []
         for f in self.state_obj.films:
-            p = (getattr(f, "title_image", "") or "").strip()
-            title_paths.append(p if (p and os.path.isfile(p)) else "")
+            src = as_image_source(getattr(f, "title_image", ""))
+            title_paths.append(src if (src is not None and src.exists()) else "")
 
         try:
             self.db_store.save_affiche(d, state_json, top_paths, bottom_paths, title_paths)
@@ -1452,7 +3309,7 @@ class App(ttk.Frame):
             return
 
         try:
-            state_json, images_map = self.db_store.load_affiche(d)
+            state_json, image_refs = self.db_store.load_affiche_meta(d)
         except KeyError as e:
             messagebox.showinfo("MySQL", str(e))
             return
@@ -1462,49 +3319,18 @@ class App(ttk.Frame):
             return
 
         try:
-            obj = json.loads(state_json)
+            loaded = affiche_state_from_json(state_json, d)
         except Exception as e:
             messagebox.showerror("MySQL", f"State JSON corrupt:\n{e}")
             return
 
         self.is_loading_row = True
         try:
-            self.start_var.set(obj.get("start_date", d.isoformat()))
-
-            films = []
-            for fobj in obj.get("films", []):
-                cells = fobj.get("cells", [""] * 14)
-                if len(cells) < 14:
-                    cells = (cells + [""] * 14)[:14]
-
-                films.append(FilmRow(
-                    name=fobj.get("name", "NAAM"),
-                    duration=fobj.get("duration", ""),
-                    version=fobj.get("version", "OV"),
-                    is_3d=bool(fobj.get("is_3d", False)),
-                    good_icons=list(fobj.get("good_icons", [])),
-                    title_image="",
-                    cells=list(cells),
-                ))
-            if not films:
-                films = [FilmRow()]
-
-            self.state_obj.films = films
+            self.start_var.set(loaded.start_date)
+            self.state_obj.films = loaded.films
 
             self.state_obj.posters.top = [""] * MAX_TOP
             self.state_obj.posters.bottom = [""] * MAX_BOTTOM
-
-            for (slot_type, idx), (fn, _mime, blob) in images_map.items():
-                if not blob:
-                    continue
-                path = safe_write_blob_to_tmp(d.isoformat(), slot_type, idx, fn, blob)
-
-                if slot_type == "top" and 0 <= idx < MAX_TOP:
-                    self.state_obj.posters.top[idx] = path
-                elif slot_type == "bottom" and 0 <= idx < MAX_BOTTOM:
-                    self.state_obj.posters.bottom[idx] = path
-                elif slot_type == "title" and 0 <= idx < len(self.state_obj.films):
-                    self.state_obj.films[idx].title_image = path
         finally:
             self.is_loading_row = False
 
@@ -1515,29 +3341,122 @@ class App(ttk.Frame):
         self.film_list.selection_set(0)
         self._load_row_into_editor(0)
         self._schedule_preview()
+
+        # posters/title images follow on a background thread, slot by slot
+        self._start_db_image_load(d, image_refs)
         messagebox.showinfo("MySQL", f"Affiche geladen voor {d.isoformat()}.")
 
-    def _cleanup_tmp_db_images(self):
-        try:
-            if not TMP_DIR.exists():
-                return
-            for p in TMP_DIR.iterdir():
-                if p.is_file():
+    def _start_db_image_load(self, d: dt.date, refs: List[AfficheImageRef]):
+        self._db_load_gen += 1
+        gen = self._db_load_gen
+        if not refs:
+            if self._db_image_poll_id is not None:
+                self.after_cancel(self._db_image_poll_id)
+                self._db_image_poll_id = None
+            self._set_db_images_loading(False)
+            return
+        # saving now would rewrite affiche_images with only the slots that arrived so far
+        self._set_db_images_loading(True)
+
+        def worker():
+            sources_by_hash: Dict[str, ImageSource] = {}
+            cn = None   # only connect when something is not cached
+
+            def connect():
+                nonlocal cn
+                if cn is None:
+                    cn = self.db_store.connect()
+                return cn
+
+            try:
+                for ref in refs:
+                    if gen != self._db_load_gen:
+                        return   # another affiche was opened meanwhile
+                    try:
+                        src = sources_by_hash.get(ref.sha256)
+                        if src is None:
+                            src = image_source_for_ref(self.db_store, d, ref, connect)
+                            if src is None:
+                                continue
+                        sources_by_hash[src.sha256] = src
+                        self._db_image_queue.put((gen, ref, src))
+                    except Exception as e:
+                        logging.exception(f"MySQL image load failed ({ref.slot_type} {ref.slot_index}): {e}")
+                        self._db_image_queue.put((gen, ref, None))
+            except Exception as e:
+                logging.exception(f"MySQL image load failed: {e}")
+            finally:
+                if cn is not None:
                     try:
-                        p.unlink()
+                        cn.close()
                     except Exception:
                         pass
-        except Exception:
-            pass
+                self._db_image_queue.put((gen, None, None))   # done marker
+
+        threading.Thread(target=worker, name="affiche-db-images", daemon=True).start()
+        if self._db_image_poll_id is None:
+            self._db_image_poll_id = self.after(50, self._poll_db_image_load)
+
+    def _poll_db_image_load(self):
+        self._db_image_poll_id = None
+        changed = False
+        finished = False
+        while True:
+            try:
+                gen, ref, src = self._db_image_queue.get_nowait()
+            except queue.Empty:
+                break
+            if gen != self._db_load_gen:
+                continue
+            if ref is None:
+                finished = True
+                continue
+            if src is None:
+                continue
+
+            idx = ref.slot_index
+            # a slot the user already filled in the meantime wins over the stored image
+            if ref.slot_type == "top" and 0 <= idx < MAX_TOP and not self.state_obj.posters.top[idx]:
+                self.state_obj.posters.top[idx] = src
+                changed = True
+            elif ref.slot_type == "bottom" and 0 <= idx < MAX_BOTTOM and not self.state_obj.posters.bottom[idx]:
+                self.state_obj.posters.bottom[idx] = src
+                changed = True
+            elif ref.slot_type == "title" and 0 <= idx < len(self.state_obj.films):
+                film = self.state_obj.films[idx]
+                if not film.title_image:
+                    film.title_image = src
+                    changed = True
+                    if idx == self.current_row_index:
+                        self.title_image_var.set(src.name)
+
+        if changed:
+            self._schedule_preview()
+        if finished:
+            self._set_db_images_loading(False)
+        else:
+            self._db_image_poll_id = self.after(50, self._poll_db_image_load)
+
+    def _set_db_images_loading(self, loading: bool):
+        self._db_images_loading = loading
+        if self.db_store:
+            self.btn_db_save.configure(state="disabled" if loading else "normal")
 
     def _on_close(self):
+        self._preview_worker.stop()
+        self._db_load_gen += 1   # a running image loader stops at its next slot
+        for attr in ("_preview_after_id", "_preview_poll_id", "_db_image_poll_id"):
+            after_id = getattr(self, attr)
+            if after_id is not None:
+                try:
+                    self.after_cancel(after_id)
+                except Exception:
+                    pass
+                setattr(self, attr, None)
         try:
-            self._cleanup_tmp_db_images()
-        finally:
-            try:
-                self.winfo_toplevel().destroy()
-            except Exception:
-                pass
+            self.winfo_toplevel().destroy()
+        except Exception:
+            pass
 
 
 # -----------------------------
@@ -1560,6 +3479,10 @@ def open_window(parent):
 # Standalone run (optional)
 # -----------------------------
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        sys.exit(batch_export_main(sys.argv[1:]))
+
     _enable_windows_dpi_awareness()
     root = tk.Tk()
     root.title(APP_TITLE)
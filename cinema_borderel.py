@@ -1,16 +1,32 @@
+import csv
 import os
 import re
 import sys
+import threading
 from pathlib import Path
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from datetime import date, datetime, timedelta
 import calendar
+from collections import OrderedDict
+from decimal import Decimal, ROUND_HALF_UP
 
+import numpy as np
 import pandas as pd
 from mysql.connector import pooling
 
+from cinema_schema import apply_migrations
+
+# Optioneel: XLSX export (write-only mode)
+try:
+    from openpyxl import Workbook
+except Exception:
+    Workbook = None
+    openpyxl_available = False
+else:
+    openpyxl_available = True
+
 # PDF (ReportLab)
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
@@ -95,6 +111,9 @@ DEFAULT_AUTEURS_RATE = 0.0120  # 1,20% op NETTO
 DEFAULT_TICKET_COUNTER_VOLW = 1
 DEFAULT_TICKET_COUNTER_KIND = 1
 
+HISTORY_CACHE_SIZE = 8  # aantal (van, tot) resultaten dat CineData bijhoudt
+HISTORY_EXPORT_BATCH = 2000  # rijen per fetchmany bij streaming export
+
 WEEKDAY_LABELS = ["Maandag", "Dinsdag", "Woensdag", "Donderdag", "Vrijdag", "Zaterdag", "Zondag"]
 LABEL_TO_WEEKDAY = {lbl: i for i, lbl in enumerate(WEEKDAY_LABELS)}
 WEEKDAY_TO_LABEL = {i: lbl for i, lbl in enumerate(WEEKDAY_LABELS)}
@@ -107,6 +126,15 @@ def get_conn():
     return POOL.get_connection()
 
 
+def db_ensure_schema() -> list[int]:
+    """Past ontbrekende schema-migraties toe (idempotent, bij opstart)."""
+    conn = get_conn()
+    try:
+        return apply_migrations(conn)
+    finally:
+        conn.close()
+
+
 def extract_variant_parts(variant: str) -> list[str]:
     if pd.isna(variant):
         return []
@@ -162,6 +190,11 @@ def _parse_percent_to_rate(s: str) -> float:
     return p / 100.0
 
 
+def _zaal_key(zaal_id: int | None) -> int:
+    # zelfde waarde als de generated column zaal_key = COALESCE(zaal_id, 0)
+    return int(zaal_id) if zaal_id is not None else 0
+
+
 def calc_ticket_end(begin: int, qty: int) -> int:
     # bij qty=0 => eind = begin - 1 (zoals borderel stijl)
     return begin + qty - 1 if qty > 0 else begin - 1
@@ -181,6 +214,410 @@ def current_speelweek_dates(today: date) -> tuple[date, date]:
     return start, end - timedelta(days=1)  # inclusive end
 
 
+# =========================
+# CineData: kolom-opslag
+# =========================
+# Kolomvolgorde zoals db_fetch_history ze selecteert (ook de CSV header).
+HIST_DB_COLUMNS = (
+    "speelweek_id",
+    "datum",
+    "weeknummer",
+    "start_datum",
+    "eind_datum",
+    "interne_titel",
+    "zaal",
+    "is_3d",
+    "aantal_volw",
+    "aantal_kind",
+    "gratis_volw",
+    "gratis_kind",
+    "bedrag_volw",
+    "bedrag_kind",
+    "totaal_aantal",
+    "totaal_bedrag",
+)
+
+# CineData Treeview kolom -> HistoryFrame kolom (sorteren)
+HIST_TREE_FIELDS = {
+    "Datum": "datum",
+    "Speelweek": "weeknummer",
+    "Week start": "start_datum",
+    "Week eind": "eind_datum",
+    "Film": "interne_titel",
+    "Zaal": "zaal",
+    "3D": "is_3d",
+    "Volw": "aantal_volw",
+    "Kind": "aantal_kind",
+    "Gratis volw": "gratis_volw",
+    "Gratis kind": "gratis_kind",
+    "Bedrag volw": "bedrag_volw",
+    "Bedrag kind": "bedrag_kind",
+    "Totaal": "totaal_aantal",
+    "Totaal bedrag": "totaal_bedrag",
+}
+
+FILTER_ALL = "Alle"
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _date_to_days(v) -> int:
+    if isinstance(v, str):
+        v = datetime.strptime(v[:10], "%Y-%m-%d").date()
+    elif isinstance(v, datetime):
+        v = v.date()
+    return v.toordinal() - _EPOCH_ORDINAL
+
+
+def _to_cents(v) -> int:
+    if v is None:
+        return 0
+    if isinstance(v, Decimal):
+        return int((v * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    return int(round(float(v) * 100))
+
+
+def _cents_str(c: int) -> str:
+    sign = "-" if c < 0 else ""
+    c = abs(int(c))
+    return f"{sign}{c // 100}.{c % 100:02d}"
+
+
+class HistoryFrame:
+    """
+    Compacte CineData resultset (kolommen i.p.v. een lijst dicts):
+    - datums als int32 (dagen sinds 1970-01-01)
+    - film/zaal als categorie: int32 codes + lijst labels
+    - bedragen als int64 centen, aantallen als int32
+    Row views (display_row) voeden de Treeview; export/totalen/sorteren werken op de kolommen.
+    """
+
+    DATE_COLS = ("datum", "start_datum", "eind_datum")
+    CAT_COLS = ("interne_titel", "zaal")
+    CENT_COLS = ("bedrag_volw", "bedrag_kind", "totaal_bedrag")
+    INT_COLS = (
+        "speelweek_id", "weeknummer", "is_3d",
+        "aantal_volw", "aantal_kind", "gratis_volw", "gratis_kind", "totaal_aantal",
+    )
+
+    def __init__(self, cols: dict, categories: dict):
+        self.cols = cols
+        self.categories = categories
+        self._date_str: dict[int, str] = {}
+        self._perms: dict[tuple[str, bool], np.ndarray] = {}
+        self._indexes: dict[str, dict[int, np.ndarray]] = {}
+
+    @classmethod
+    def from_rows(cls, rows) -> "HistoryFrame":
+        """rows: tuples in HIST_DB_COLUMNS volgorde (zoals de DB cursor ze geeft)."""
+        rows = list(rows)
+        n = len(rows)
+        raw = dict(zip(HIST_DB_COLUMNS, zip(*rows))) if n else {c: () for c in HIST_DB_COLUMNS}
+
+        cols: dict[str, np.ndarray] = {}
+        categories: dict[str, list[str]] = {}
+
+        for c in cls.DATE_COLS:
+            cols[c] = np.fromiter((_date_to_days(v) for v in raw[c]), dtype=np.int32, count=n)
+        for c in cls.INT_COLS:
+            cols[c] = np.fromiter((int(v or 0) for v in raw[c]), dtype=np.int32, count=n)
+        for c in cls.CENT_COLS:
+            cols[c] = np.fromiter((_to_cents(v) for v in raw[c]), dtype=np.int64, count=n)
+        for c in cls.CAT_COLS:
+            lookup: dict[str, int] = {}
+            labels: list[str] = []
+            codes = np.empty(n, dtype=np.int32)
+            for i, v in enumerate(raw[c]):
+                s = "" if v is None else str(v)
+                code = lookup.get(s)
+                if code is None:
+                    code = lookup[s] = len(labels)
+                    labels.append(s)
+                codes[i] = code
+            cols[c] = codes
+            categories[c] = labels
+
+        return cls(cols, categories)
+
+    def __len__(self) -> int:
+        return int(self.cols["datum"].shape[0])
+
+    def date_str(self, days: int) -> str:
+        s = self._date_str.get(days)
+        if s is None:
+            s = self._date_str[days] = date.fromordinal(int(days) + _EPOCH_ORDINAL).isoformat()
+        return s
+
+    def label(self, col: str, i: int) -> str:
+        return self.categories[col][int(self.cols[col][i])]
+
+    def display_row(self, i: int) -> tuple:
+        """Waarden in de volgorde van de CineData Treeview kolommen."""
+        c = self.cols
+        return (
+            self.date_str(c["datum"][i]),
+            str(int(c["weeknummer"][i])),
+            self.date_str(c["start_datum"][i]),
+            self.date_str(c["eind_datum"][i]),
+            self.label("interne_titel", i),
+            self.label("zaal", i),
+            "✅" if int(c["is_3d"][i]) == 1 else "",
+            int(c["aantal_volw"][i]),
+            int(c["aantal_kind"][i]),
+            int(c["gratis_volw"][i]),
+            int(c["gratis_kind"][i]),
+            _cents_str(c["bedrag_volw"][i]),
+            _cents_str(c["bedrag_kind"][i]),
+            int(c["totaal_aantal"][i]),
+            _cents_str(c["totaal_bedrag"][i]),
+        )
+
+    def speelweek_id(self, i: int) -> int:
+        return int(self.cols["speelweek_id"][i])
+
+    def totals(self, idx: np.ndarray | None = None) -> dict:
+        c = self.cols if idx is None else {k: v[idx] for k, v in self.cols.items()}
+        return {
+            "tickets": int(c["totaal_aantal"].sum()),
+            "gratis": int(c["gratis_volw"].sum() + c["gratis_kind"].sum()),
+            "bedrag_cents": int(c["totaal_bedrag"].sum()),
+        }
+
+    def sort_permutation(self, col: str, descending: bool = False) -> np.ndarray:
+        """
+        Stabiele permutatie voor een kolom (gememoized per richting). Aflopend sorteert op
+        de negatieve sleutel, zodat gelijke waarden net als bij ORDER BY ... DESC hun
+        oorspronkelijke volgorde houden.
+        """
+        perm = self._perms.get((col, descending))
+        if perm is None:
+            keys = self.cols[col]
+            if col in self.CAT_COLS:
+                labels = self.categories[col]
+                rank = np.empty(len(labels), dtype=np.int32)
+                rank[sorted(range(len(labels)), key=lambda k: labels[k].casefold())] = np.arange(len(labels))
+                keys = rank[keys] if len(labels) else keys
+            keys = -keys.astype(np.int64) if descending else keys
+            perm = np.argsort(keys, kind="stable")
+            self._perms[(col, descending)] = perm
+        return perm
+
+    def value_index(self, col: str) -> dict[int, np.ndarray]:
+        """Per waarde (code/dag/0-1) de rij-indexen, gememoized per kolom."""
+        index = self._indexes.get(col)
+        if index is None:
+            keys = self.cols[col]
+            perm = np.argsort(keys, kind="stable")
+            uniq, starts = np.unique(keys[perm], return_index=True)
+            bounds = list(starts[1:]) + [len(perm)]
+            index = {int(u): perm[a:b] for u, a, b in zip(uniq, starts, bounds)}
+            self._indexes[col] = index
+        return index
+
+    def values_for(self, col: str) -> list[str]:
+        """Aanwezige waarden (als tekst) voor filter-keuzelijsten."""
+        if col in self.CAT_COLS:
+            return sorted((self.categories[col][k] for k in self.value_index(col)), key=str.casefold)
+        if col in self.DATE_COLS:
+            return [self.date_str(k) for k in sorted(self.value_index(col))]
+        return [str(k) for k in sorted(self.value_index(col))]
+
+    def _rows_for(self, col: str, keys) -> np.ndarray:
+        index = self.value_index(col)
+        parts = [index[k] for k in keys if k in index]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    def filter_mask(
+        self,
+        film: str = "",
+        zaal: str | None = None,
+        is_3d: bool | None = None,
+        datum: date | None = None,
+    ) -> np.ndarray | None:
+        """
+        Bool-mask voor de filters (None = geen filter actief).
+        film = deeltekst (hoofdletterongevoelig), zaal = exacte naam.
+        """
+        n = len(self)
+        mask = None
+
+        def narrow(rows: np.ndarray):
+            nonlocal mask
+            m = np.zeros(n, dtype=bool)
+            m[rows] = True
+            mask = m if mask is None else (mask & m)
+
+        film = (film or "").strip().casefold()
+        if film:
+            labels = self.categories["interne_titel"]
+            narrow(self._rows_for("interne_titel", [k for k, lbl in enumerate(labels) if film in lbl.casefold()]))
+        if zaal is not None:
+            labels = self.categories["zaal"]
+            narrow(self._rows_for("zaal", [k for k, lbl in enumerate(labels) if lbl == zaal]))
+        if is_3d is not None:
+            narrow(self._rows_for("is_3d", [1 if is_3d else 0]))
+        if datum is not None:
+            narrow(self._rows_for("datum", [_date_to_days(datum)]))
+        return mask
+
+    def view(self, sort_col: str | None = None, descending: bool = False, mask: np.ndarray | None = None) -> np.ndarray:
+        """Rij-indexen in weergavevolgorde (gesorteerd + gefilterd)."""
+        if sort_col:
+            order = self.sort_permutation(sort_col, descending)
+        else:
+            order = np.arange(len(self))
+        if mask is not None:
+            order = order[mask[order]]
+        return order
+
+    def set_weeknummer(self, speelweek_id: int, weeknummer: int) -> np.ndarray:
+        """Past het weeknummer van een speelweek aan; geeft de gewijzigde rij-indexen terug."""
+        rows = np.flatnonzero(self.cols["speelweek_id"] == int(speelweek_id))
+        self.cols["weeknummer"][rows] = int(weeknummer)
+        self._perms.pop(("weeknummer", False), None)
+        self._perms.pop(("weeknummer", True), None)
+        self._indexes.pop("weeknummer", None)
+        return rows
+
+    def to_csv(self, path: str, idx: np.ndarray | None = None) -> None:
+        order = range(len(self)) if idx is None else idx
+        c = self.cols
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            w = csv.writer(fh)
+            w.writerow(HIST_DB_COLUMNS)
+            for i in order:
+                w.writerow((
+                    int(c["speelweek_id"][i]),
+                    self.date_str(c["datum"][i]),
+                    int(c["weeknummer"][i]),
+                    self.date_str(c["start_datum"][i]),
+                    self.date_str(c["eind_datum"][i]),
+                    self.label("interne_titel", i),
+                    self.label("zaal", i),
+                    int(c["is_3d"][i]),
+                    int(c["aantal_volw"][i]),
+                    int(c["aantal_kind"][i]),
+                    int(c["gratis_volw"][i]),
+                    int(c["gratis_kind"][i]),
+                    _cents_str(c["bedrag_volw"][i]),
+                    _cents_str(c["bedrag_kind"][i]),
+                    int(c["totaal_aantal"][i]),
+                    _cents_str(c["totaal_bedrag"][i]),
+                ))
+
+
+# =========================
+# CineData cache
+# =========================
+class HistoryCache:
+    """
+    Kleine LRU cache van CineData resultaten, key = (van, tot) (beide inclusief).
+    - eigen writes: invalidate_dates()/invalidate_range() met de aangeraakte datum(s)
+    - writes van andere werkposten: watermark op daily_sales (updated_at, COUNT, SUM(id)) + speelweek
+    """
+
+    def __init__(self, max_entries: int = HISTORY_CACHE_SIZE):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[tuple[date, date], object] = OrderedDict()
+        self._watermark: tuple | None = None
+
+    def get(self, from_date: date, to_date: date):
+        key = (from_date, to_date)
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, from_date: date, to_date: date, frame) -> None:
+        key = (from_date, to_date)
+        self._entries[key] = frame
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def invalidate_dates(self, dates) -> None:
+        dates = [d for d in dates if d is not None]
+        if not dates:
+            return
+        for key in list(self._entries):
+            f, t = key
+            if any(f <= d <= t for d in dates):
+                del self._entries[key]
+
+    def invalidate_range(self, start: date, end_excl: date) -> None:
+        """Alle entries die [start, end_excl) overlappen (bv. een speelweek)."""
+        for key in list(self._entries):
+            f, t = key
+            if f < end_excl and start <= t:
+                del self._entries[key]
+
+    def sync(self, conn) -> None:
+        """
+        Eén goedkope query: MAX(updated_at), COUNT(*), SUM(id) en MAX(id) van daily_sales
+        en MAX(updated_at) van speelweek. Is er iets veranderd sinds de vorige sync (andere
+        werkpost), dan worden enkel de aangeraakte datums/speelweken geïnvalideerd.
+        Nieuwe rijen = id > vorige MAX(id) (ongeacht hun updated_at); verklaren die het
+        verschil in COUNT/SUM(id) niet, dan zijn er rijen verwijderd => alles weg.
+        NB: updated_at heeft seconde-resolutie, daarom vergelijken we met >=.
+        """
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT ds.max_upd, ds.n, ds.id_sum, ds.id_max,
+                   (SELECT MAX(updated_at) FROM speelweek)
+            FROM (
+              SELECT MAX(updated_at) AS max_upd, COUNT(*) AS n,
+                     COALESCE(SUM(id), 0) AS id_sum, COALESCE(MAX(id), 0) AS id_max
+              FROM daily_sales
+            ) ds
+            """
+        )
+        row = cur.fetchone()
+        wm = (row[0], int(row[1] or 0), int(row[2] or 0), int(row[3] or 0), row[4])
+        prev = self._watermark
+        self._watermark = wm
+        if prev is None:
+            self.clear()
+            return
+        if prev == wm or not self._entries:
+            return
+
+        prev_ds_max, prev_ds_count, prev_ds_sum, prev_ds_id_max, prev_sw_max = prev
+        ds_max, ds_count, ds_sum, ds_id_max, sw_max = wm
+
+        if (ds_count, ds_sum, ds_id_max) != (prev_ds_count, prev_ds_sum, prev_ds_id_max):
+            cur.execute(
+                "SELECT datum, COUNT(*), SUM(id) FROM daily_sales WHERE id > %s GROUP BY datum",
+                (prev_ds_id_max,),
+            )
+            new_rows = cur.fetchall()
+            if (prev_ds_count + sum(int(r[1]) for r in new_rows) != ds_count
+                    or prev_ds_sum + sum(int(r[2]) for r in new_rows) != ds_sum):
+                self.clear()
+                return
+            self.invalidate_dates([r[0] for r in new_rows])
+
+        if ds_max != prev_ds_max:
+            if prev_ds_max is None:
+                self.clear()
+                return
+            cur.execute("SELECT DISTINCT datum FROM daily_sales WHERE updated_at >= %s", (prev_ds_max,))
+            self.invalidate_dates([r[0] for r in cur.fetchall()])
+
+        if sw_max != prev_sw_max:
+            if prev_sw_max is None:
+                self.clear()
+                return
+            cur.execute("SELECT start_datum, eind_datum FROM speelweek WHERE updated_at >= %s", (prev_sw_max,))
+            for start, end in cur.fetchall():
+                self.invalidate_range(start, end)
+
+HISTORY_CACHE = HistoryCache()
+
+
 # =========================
 # DB functions
 # =========================
@@ -297,8 +734,14 @@ def db_update_speelweek_weeknummer(speelweek_id: int, new_weeknr: int) -> None:
         cur = conn.cursor()
         cur.execute("UPDATE speelweek SET weeknummer=%s WHERE id=%s", (int(new_weeknr), int(speelweek_id)))
         conn.commit()
+        cur.execute("SELECT start_datum, eind_datum FROM speelweek WHERE id=%s", (int(speelweek_id),))
+        row = cur.fetchone()
     finally:
         conn.close()
+    if row:
+        HISTORY_CACHE.invalidate_range(row[0], row[1])
+    else:
+        HISTORY_CACHE.clear()
 
 
 def db_get_film_by_interne_titel(interne_titel: str):
@@ -410,6 +853,7 @@ def db_upsert_daily_sales(
         conn.commit()
     finally:
         conn.close()
+    HISTORY_CACHE.invalidate_dates([datum])
 
 
 def db_sum_paid_qty_for_speelweek(speelweek_id: int, film_id: int, zaal_id: int | None) -> tuple[int, int]:
@@ -424,9 +868,9 @@ def db_sum_paid_qty_for_speelweek(speelweek_id: int, film_id: int, zaal_id: int
             FROM daily_sales
             WHERE speelweek_id=%s
               AND film_id=%s
-              AND COALESCE(zaal_id,0)=COALESCE(%s,0)
+              AND zaal_key=%s
             """,
-            (speelweek_id, film_id, zaal_id),
+            (speelweek_id, film_id, _zaal_key(zaal_id)),
         )
         row = cur.fetchone()
         return int(row[0] or 0), int(row[1] or 0)
@@ -462,9 +906,9 @@ def db_get_or_create_ticket_range(speelweek_id: int, film_id: int, zaal_id: int
             """
             SELECT begin_volw, begin_kind
             FROM ticket_ranges
-            WHERE speelweek_id=%s AND film_id=%s AND COALESCE(zaal_id,0)=COALESCE(%s,0)
+            WHERE speelweek_id=%s AND film_id=%s AND zaal_key=%s
             """,
-            (speelweek_id, film_id, zaal_id),
+            (speelweek_id, film_id, _zaal_key(zaal_id)),
         )
         row = cur.fetchone()
         if row:
@@ -488,12 +932,12 @@ def db_get_or_create_ticket_range(speelweek_id: int, film_id: int, zaal_id: int
             FROM ticket_ranges tr
             JOIN speelweek sw2 ON sw2.id = tr.speelweek_id
             WHERE tr.film_id=%s
-              AND COALESCE(tr.zaal_id,0)=COALESCE(%s,0)
+              AND tr.zaal_key=%s
               AND sw2.start_datum < %s
             ORDER BY sw2.start_datum DESC
             LIMIT 1
             """,
-            (film_id, zaal_id, start_datum),
+            (film_id, _zaal_key(zaal_id), start_datum),
         )
         prev = cur.fetchone()
 
@@ -534,42 +978,143 @@ def db_get_or_create_ticket_range(speelweek_id: int, film_id: int, zaal_id: int
         conn.close()
 
 
-def db_fetch_history(from_date: date, to_date: date):
+# Kolommen in HIST_DB_COLUMNS volgorde
+HISTORY_SELECT_SQL = """
+    SELECT
+      ds.speelweek_id,
+      ds.datum,
+      sw.weeknummer,
+      sw.start_datum,
+      sw.eind_datum,
+      f.interne_titel,
+      z.naam AS zaal,
+      ds.is_3d,
+      ds.aantal_volw,
+      ds.aantal_kind,
+      ds.gratis_volw,
+      ds.gratis_kind,
+      ds.bedrag_volw,
+      ds.bedrag_kind,
+      ds.totaal_aantal,
+      ds.totaal_bedrag
+    FROM daily_sales ds
+    JOIN films f ON f.id = ds.film_id
+    JOIN speelweek sw ON sw.id = ds.speelweek_id
+    LEFT JOIN zalen z ON z.id = ds.zaal_id
+    WHERE ds.datum BETWEEN %s AND %s
+    ORDER BY ds.datum ASC, z.naam ASC, f.interne_titel ASC
+"""
+
+
+def db_fetch_history(from_date: date, to_date: date) -> HistoryFrame:
     conn = get_conn()
     try:
-        cur = conn.cursor(dictionary=True)
-        cur.execute(
-            """
-            SELECT
-              ds.speelweek_id,
-              ds.datum,
-              sw.weeknummer,
-              sw.start_datum,
-              sw.eind_datum,
-              f.interne_titel,
-              z.naam AS zaal,
-              ds.is_3d,
-              ds.aantal_volw,
-              ds.aantal_kind,
-              ds.gratis_volw,
-              ds.gratis_kind,
-              ds.bedrag_volw,
-              ds.bedrag_kind,
-              ds.totaal_aantal,
-              ds.totaal_bedrag
-            FROM daily_sales ds
-            JOIN films f ON f.id = ds.film_id
-            JOIN speelweek sw ON sw.id = ds.speelweek_id
-            LEFT JOIN zalen z ON z.id = ds.zaal_id
-            WHERE ds.datum BETWEEN %s AND %s
-            ORDER BY ds.datum ASC, z.naam ASC, f.interne_titel ASC
-            """,
-            (from_date, to_date),
-        )
-        return cur.fetchall()
+        cur = conn.cursor()
+        cur.execute(HISTORY_SELECT_SQL, (from_date, to_date))
+        return HistoryFrame.from_rows(cur.fetchall())
+    finally:
+        conn.close()
+
+
+def db_stream_history(from_date: date, to_date: date, batch_size: int = HISTORY_EXPORT_BATCH):
+    """
+    Generator van batches (lijst tuples) uit een unbuffered cursor (server-side streaming).
+    Wordt de generator vroeg afgebroken, dan wordt de socket gesloten i.p.v. de rest van de
+    resultset op te halen; de pool verbindt die connectie opnieuw bij het volgende gebruik.
+    """
+    conn = get_conn()
+    done = False
+    try:
+        cur = conn.cursor(buffered=False)
+        cur.execute(HISTORY_SELECT_SQL, (from_date, to_date))
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                done = True
+                break
+            yield batch
+    finally:
+        if done:
+            conn.close()
+        else:
+            try:
+                conn.disconnect()
+            except Exception:
+                pass
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def db_fetch_history_cached(from_date: date, to_date: date) -> HistoryFrame:
+    """Zoals db_fetch_history, maar herhaalde views kosten enkel de watermark-query."""
+    conn = get_conn()
+    try:
+        HISTORY_CACHE.sync(conn)
     finally:
         conn.close()
 
+    frame = HISTORY_CACHE.get(from_date, to_date)
+    if frame is None:
+        frame = db_fetch_history(from_date, to_date)
+        HISTORY_CACHE.put(from_date, to_date, frame)
+    return frame
+
+
+# =========================
+# CineData: streaming export
+# =========================
+def _export_cell(v):
+    if v is None:
+        return ""
+    if isinstance(v, (date, datetime)):
+        return v.isoformat()[:10]
+    return v
+
+
+def export_history_stream(from_date: date, to_date: date, path: str, progress=None, should_cancel=None) -> int:
+    """
+    Schrijft CineData rechtstreeks van de server naar CSV of XLSX (op basis van extensie).
+    Geheugen blijft constant: per fetchmany-batch schrijven, geen DataFrame.
+    progress(n_rows) wordt na elke batch opgeroepen; should_cancel() => stoppen.
+    Geeft het aantal geschreven rijen terug.
+    """
+    is_xlsx = path.lower().endswith(".xlsx")
+    if is_xlsx and not openpyxl_available:
+        raise RuntimeError("XLSX export vereist openpyxl. Doe: pip install openpyxl")
+
+    n = 0
+    batches = db_stream_history(from_date, to_date)
+    try:
+        if is_xlsx:
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("CineData")
+            ws.append(list(HIST_DB_COLUMNS))
+            for batch in batches:
+                for r in batch:
+                    ws.append([_export_cell(v) for v in r])
+                n += len(batch)
+                if progress:
+                    progress(n)
+                if should_cancel and should_cancel():
+                    break
+            wb.save(path)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as fh:
+                w = csv.writer(fh)
+                w.writerow(HIST_DB_COLUMNS)
+                for batch in batches:
+                    w.writerows([_export_cell(v) for v in r] for r in batch)
+                    n += len(batch)
+                    if progress:
+                        progress(n)
+                    if should_cancel and should_cancel():
+                        break
+    finally:
+        batches.close()
+    return n
+
 
 # =========================
 # PDF: DB queries
@@ -606,7 +1151,7 @@ def db_fetch_borderel_combos(from_date: date, to_date: date):
         conn.close()
 
 
-def db_fetch_week_sales_for_film_zaal(speelweek_id: int, film_id: int, zaal_naam: str):
+def db_fetch_week_sales_for_film_zaal(speelweek_id: int, film_id: int, zaal_id: int | None):
     conn = get_conn()
     try:
         cur = conn.cursor(dictionary=True)
@@ -630,10 +1175,10 @@ def db_fetch_week_sales_for_film_zaal(speelweek_id: int, film_id: int, zaal_naam
             LEFT JOIN zalen z ON z.id = ds.zaal_id
             WHERE ds.speelweek_id = %s
               AND ds.film_id = %s
-              AND COALESCE(z.naam, '') = %s
+              AND ds.zaal_key = %s
             ORDER BY ds.datum ASC
             """,
-            (speelweek_id, film_id, zaal_naam or ""),
+            (speelweek_id, film_id, _zaal_key(zaal_id)),
         )
         return cur.fetchall()
     finally:
@@ -1356,8 +1901,13 @@ class SumUpFilmApp:
         self._active_col_index = None
         self._active_value = None
 
-        self._history_cache = []
-        self._hist_item_meta = {}
+        self._history_cache = HistoryFrame.from_rows([])
+        self._hist_tree_frame: HistoryFrame | None = None   # frame waarvan de rijen in hist_tree staan
+        self._hist_view = np.empty(0, dtype=np.intp)
+        self._hist_sort_col: str | None = None
+        self._hist_sort_desc = False
+        self._hist_filter_after_id = None
+        self._stream_export = None
 
         # --- CineData copy (rechterklik) ---
         self._hist_active_item = None
@@ -1365,6 +1915,12 @@ class SumUpFilmApp:
         self._hist_active_value = None
         self.hist_menu = None
 
+        # de queries gaan uit van zaal_key: zonder geslaagde migratie niet verder
+        try:
+            db_ensure_schema()
+        except Exception as e:
+            raise RuntimeError(f"Schema-migratie mislukt:\n\n{e}") from e
+
         self._build_ui()
         self._bind_copy_shortcuts()
         self._load_settings_into_ui()
@@ -1870,11 +2426,48 @@ class SumUpFilmApp:
         ttk.Button(top, text="Huidige speelweek", command=self._set_cinedata_to_current_week_and_refresh).pack(side="left", padx=8)
 
         ttk.Button(top, text="Export historiek (CSV)", command=self.export_history_csv).pack(side="left", padx=8)
+        ttk.Button(top, text="Export periode (DB)…", command=self.export_history_period).pack(side="left", padx=8)
+        self.btn_stop_export = ttk.Button(top, text="Stop export", command=self.cancel_history_period_export,
+                                          state="disabled")
+        self.btn_stop_export.pack(side="left")
         ttk.Button(top, text="Maak borderel", command=self.export_borderels_pdf_bo1).pack(side="left", padx=8)
 
         self.hist_status = tk.StringVar(value="")
         ttk.Label(top, textvariable=self.hist_status).pack(side="left", padx=20)
 
+        # Filterbalk (werkt op de geladen resultset, geen DB round trip)
+        flt = ttk.Frame(self.tab_history)
+        flt.pack(fill="x", pady=(8, 0))
+
+        ttk.Label(flt, text="Film:").pack(side="left")
+        self.hist_filter_film = tk.StringVar(value="")
+        ttk.Entry(flt, textvariable=self.hist_filter_film, width=28).pack(side="left", padx=(6, 14))
+
+        ttk.Label(flt, text="Zaal:").pack(side="left")
+        self.hist_filter_zaal = tk.StringVar(value=FILTER_ALL)
+        self.hist_filter_zaal_combo = ttk.Combobox(
+            flt, textvariable=self.hist_filter_zaal, values=[FILTER_ALL], state="readonly", width=10
+        )
+        self.hist_filter_zaal_combo.pack(side="left", padx=(6, 14))
+
+        ttk.Label(flt, text="3D:").pack(side="left")
+        self.hist_filter_3d = tk.StringVar(value=FILTER_ALL)
+        ttk.Combobox(
+            flt, textvariable=self.hist_filter_3d, values=[FILTER_ALL, "Ja", "Nee"], state="readonly", width=6
+        ).pack(side="left", padx=(6, 14))
+
+        ttk.Label(flt, text="Datum:").pack(side="left")
+        self.hist_filter_datum = tk.StringVar(value=FILTER_ALL)
+        self.hist_filter_datum_combo = ttk.Combobox(
+            flt, textvariable=self.hist_filter_datum, values=[FILTER_ALL], state="readonly", width=12
+        )
+        self.hist_filter_datum_combo.pack(side="left", padx=(6, 14))
+
+        ttk.Button(flt, text="Wis filters", command=self._clear_hist_filters).pack(side="left")
+
+        for v in [self.hist_filter_film, self.hist_filter_zaal, self.hist_filter_3d, self.hist_filter_datum]:
+            v.trace_add("write", lambda *_: self._schedule_hist_filter())
+
         mid = ttk.Frame(self.tab_history)
         mid.pack(fill="both", expand=True, pady=(10, 0))
 
@@ -1898,7 +2491,7 @@ class SumUpFilmApp:
 
         self.hist_tree = ttk.Treeview(mid, columns=self.hist_cols, show="headings")
         for ccol in self.hist_cols:
-            self.hist_tree.heading(ccol, text=ccol)
+            self.hist_tree.heading(ccol, text=ccol, command=lambda cc=ccol: self._hist_sort_by(cc))
             if ccol == "Film":
                 self.hist_tree.column(ccol, width=320, anchor="w")
             elif ccol == "Zaal":
@@ -1941,41 +2534,95 @@ class SumUpFilmApp:
             return
 
         try:
-            rows = db_fetch_history(f, t)
+            frame = db_fetch_history_cached(f, t)
         except Exception as e:
             messagebox.showerror("DB fout", f"Kon CineData niet ophalen:\n\n{e}", parent=self.toplevel)
             return
 
-        self._history_cache = rows
-        self._hist_item_meta = {}
+        self._history_cache = frame
+
+        zalen = frame.values_for("zaal")
+        self.hist_filter_zaal_combo.configure(values=[FILTER_ALL] + zalen)
+        if self.hist_filter_zaal.get() not in zalen:
+            self.hist_filter_zaal.set(FILTER_ALL)
+
+        datums = frame.values_for("datum")
+        self.hist_filter_datum_combo.configure(values=[FILTER_ALL] + datums)
+        if self.hist_filter_datum.get() not in datums:
+            self.hist_filter_datum.set(FILTER_ALL)
+
+        self._apply_hist_view()
+
+    def _hist_filter_mask(self):
+        zaal = self.hist_filter_zaal.get()
+        d3 = self.hist_filter_3d.get()
+        datum = self.hist_filter_datum.get()
+        return self._history_cache.filter_mask(
+            film=self.hist_filter_film.get(),
+            zaal=None if zaal == FILTER_ALL else zaal,
+            is_3d=None if d3 == FILTER_ALL else (d3 == "Ja"),
+            datum=None if datum == FILTER_ALL else datetime.strptime(datum, "%Y-%m-%d").date(),
+        )
 
-        self.hist_tree.delete(*self.hist_tree.get_children())
+    def _apply_hist_view(self):
+        if self._hist_filter_after_id is not None:
+            self.toplevel.after_cancel(self._hist_filter_after_id)
+            self._hist_filter_after_id = None
 
-        for r in rows:
-            item_id = self.hist_tree.insert(
-                "",
-                "end",
-                values=(
-                    str(r["datum"]),
-                    str(r["weeknummer"]),
-                    str(r["start_datum"]),
-                    str(r["eind_datum"]),
-                    r["interne_titel"],
-                    r["zaal"] or "",
-                    "✅" if int(r["is_3d"]) == 1 else "",
-                    int(r["aantal_volw"]),
-                    int(r["aantal_kind"]),
-                    int(r["gratis_volw"]),
-                    int(r["gratis_kind"]),
-                    f"{float(r['bedrag_volw']):.2f}",
-                    f"{float(r['bedrag_kind']):.2f}",
-                    int(r["totaal_aantal"]),
-                    f"{float(r['totaal_bedrag']):.2f}",
-                ),
-            )
-            self._hist_item_meta[item_id] = {"speelweek_id": int(r["speelweek_id"])}
+        frame = self._history_cache
+        sort_field = HIST_TREE_FIELDS.get(self._hist_sort_col) if self._hist_sort_col else None
+        view = frame.view(sort_field, self._hist_sort_desc, self._hist_filter_mask())
+        self._hist_view = view
+
+        for ccol in self.hist_cols:
+            arrow = ""
+            if ccol == self._hist_sort_col:
+                arrow = " ▼" if self._hist_sort_desc else " ▲"
+            self.hist_tree.heading(ccol, text=ccol + arrow)
+
+        # Rijen één keer per geladen frame invoegen (iid = rij-index); sorteren/filteren
+        # herschikt ze daarna met één set_children (niet-getoonde rijen worden losgekoppeld).
+        if self._hist_tree_frame is not frame:
+            old = self._hist_tree_frame
+            if old is not None and len(old):
+                self.hist_tree.delete(*map(str, range(len(old))))
+            for i in range(len(frame)):
+                self.hist_tree.insert("", "end", iid=str(i), values=frame.display_row(i))
+            self._hist_tree_frame = frame
+        self.hist_tree.set_children("", *map(str, view))
+
+        f = self.hist_from.get_date()
+        t = self.hist_to.get_date()
+        tot = frame.totals(view)
+        shown = f"{len(view)} van {len(frame)}" if len(view) != len(frame) else f"{len(frame)}"
+        self.hist_status.set(
+            f"{shown} records (van {f} tot {t}) | "
+            f"Totaal tickets: {tot['tickets']} (gratis: {tot['gratis']}) | "
+            f"Totaal bedrag: {_money(tot['bedrag_cents'] / 100.0)}"
+        )
+
+    def _hist_sort_by(self, col: str):
+        if self._hist_sort_col == col:
+            self._hist_sort_desc = not self._hist_sort_desc
+        else:
+            self._hist_sort_col = col
+            self._hist_sort_desc = False
+        self._apply_hist_view()
+
+    def _schedule_hist_filter(self):
+        if self._hist_filter_after_id is not None:
+            self.toplevel.after_cancel(self._hist_filter_after_id)
+        self._hist_filter_after_id = self.toplevel.after(150, self._run_hist_filter)
+
+    def _run_hist_filter(self):
+        self._hist_filter_after_id = None
+        self._apply_hist_view()
 
-        self.hist_status.set(f"{len(rows)} records (van {f} tot {t})")
+    def _clear_hist_filters(self):
+        self.hist_filter_film.set("")
+        self.hist_filter_zaal.set(FILTER_ALL)
+        self.hist_filter_3d.set(FILTER_ALL)
+        self.hist_filter_datum.set(FILTER_ALL)
 
     def _start_edit_weeknr(self, event):
         region = self.hist_tree.identify("region", event.x, event.y)
@@ -2014,13 +2661,13 @@ class SumUpFilmApp:
             entry.destroy()
             return
 
-        meta = self._hist_item_meta.get(item)
-        if not meta:
+        frame = self._history_cache
+        if self._hist_tree_frame is not frame or not item.isdigit() or int(item) >= len(frame):
             entry.destroy()
             messagebox.showerror("Fout", "Geen speelweek_id gevonden voor deze rij.", parent=self.toplevel)
             return
 
-        speelweek_id = int(meta["speelweek_id"])
+        speelweek_id = frame.speelweek_id(int(item))
 
         try:
             db_update_speelweek_weeknummer(speelweek_id, new_weeknr)
@@ -2029,9 +2676,10 @@ class SumUpFilmApp:
             messagebox.showerror("DB fout", f"Kon speelweeknummer niet aanpassen:\n\n{e}", parent=self.toplevel)
             return
 
-        values = list(self.hist_tree.item(item, "values"))
-        values[col_index] = str(new_weeknr)
-        self.hist_tree.item(item, values=values)
+        # alle rijen van deze speelweek, ook de niet-getoonde (losgekoppelde) items
+        col_name = self.hist_cols[col_index]
+        for i in frame.set_weeknummer(speelweek_id, new_weeknr):
+            self.hist_tree.set(str(i), col_name, str(new_weeknr))
         entry.destroy()
         self.hist_status.set("Speelweeknummer aangepast.")
 
@@ -2103,15 +2751,89 @@ class SumUpFilmApp:
         self.hist_status.set(f"Gekopieerd: {col_name} = {text}")
 
     def export_history_csv(self):
-        if not self._history_cache:
+        if not len(self._history_cache):
             messagebox.showinfo("Info", "Geen CineData om te exporteren.", parent=self.toplevel)
             return
         path = filedialog.asksaveasfilename(defaultextension=".csv", parent=self.toplevel)
         if not path:
             return
-        pd.DataFrame(self._history_cache).to_csv(path, index=False)
+        self._history_cache.to_csv(path, self._hist_view)
         messagebox.showinfo("Export", "CineData CSV opgeslagen.", parent=self.toplevel)
 
+    def export_history_period(self):
+        """Streaming export van de volledige periode rechtstreeks uit MySQL (achtergrond-thread)."""
+        f = self.hist_from.get_date()
+        t = self.hist_to.get_date()
+        if t < f:
+            messagebox.showerror("Fout", "‘Tot’ mag niet vóór ‘Van’ liggen.", parent=self.toplevel)
+            return
+        if self._stream_export is not None:
+            messagebox.showinfo("Export", "Er loopt al een export.", parent=self.toplevel)
+            return
+
+        filetypes = [("CSV bestanden", "*.csv")]
+        if openpyxl_available:
+            filetypes.append(("Excel bestanden", "*.xlsx"))
+        path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=filetypes,
+            initialfile=f"CineData {f.isoformat()} tot {t.isoformat()}.csv",
+            parent=self.toplevel,
+        )
+        if not path:
+            return
+
+        state = {"rows": 0, "done": False, "error": None, "cancel": False}
+        self._stream_export = state
+        self.btn_stop_export.configure(state="normal")
+
+        def work():
+            try:
+                state["rows"] = export_history_stream(
+                    f, t, path,
+                    progress=lambda n: state.__setitem__("rows", n),
+                    should_cancel=lambda: state["cancel"],
+                )
+            except Exception as e:
+                state["error"] = e
+            finally:
+                state["done"] = True
+
+        threading.Thread(target=work, daemon=True).start()
+        self._poll_history_period_export(path)
+
+    def cancel_history_period_export(self):
+        state = self._stream_export
+        if state is not None and not state["done"]:
+            state["cancel"] = True
+            self.hist_status.set("Export wordt gestopt…")
+
+    def _poll_history_period_export(self, path: str):
+        state = self._stream_export
+        if state is None:
+            return
+        if not state["done"]:
+            self.hist_status.set(f"Export bezig… {state['rows']} rijen")
+            self.toplevel.after(200, lambda: self._poll_history_period_export(path))
+            return
+
+        self._stream_export = None
+        self.btn_stop_export.configure(state="disabled")
+        if state["cancel"]:
+            # onvolledig bestand niet laten staan
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.hist_status.set(f"Export gestopt na {state['rows']} rijen.")
+            return
+        if state["error"] is not None:
+            self.hist_status.set("Export mislukt.")
+            messagebox.showerror("Export", f"Export mislukt:\n\n{state['error']}", parent=self.toplevel)
+            return
+        self.hist_status.set(f"Export klaar: {state['rows']} rijen.")
+        messagebox.showinfo("Export", f"{state['rows']} rijen geëxporteerd naar:\n{path}", parent=self.toplevel)
+
     def export_borderels_pdf_bo1(self):
         f = self.hist_from.get_date()
         t = self.hist_to.get_date()
@@ -2143,10 +2865,11 @@ class SumUpFilmApp:
         for c_ in combos:
             speelweek_id = int(c_["speelweek_id"])
             film_id = int(c_["film_id"])
+            zaal_id = c_.get("zaal_id")
             zaal_naam = (c_.get("zaal") or "").strip()
 
             try:
-                week_rows = db_fetch_week_sales_for_film_zaal(speelweek_id, film_id, zaal_naam)
+                week_rows = db_fetch_week_sales_for_film_zaal(speelweek_id, film_id, zaal_id)
                 if not week_rows:
                     continue
 
@@ -2281,7 +3004,11 @@ def open_window(parent):
     win.title("Cinema BackOffice – SumUp Filmrapport")
     win.geometry("1400x860")
     set_window_icon(win)
-    SumUpFilmApp(win)
+    try:
+        SumUpFilmApp(win)
+    except Exception:
+        win.destroy()
+        raise
     win.transient(parent)
     return win
 
@@ -2289,7 +3016,12 @@ def open_window(parent):
 def main():
     root = tk.Tk()
     set_window_icon(root)
-    SumUpFilmApp(root)
+    try:
+        SumUpFilmApp(root)
+    except Exception as e:
+        messagebox.showerror("DB schema", str(e), parent=root)
+        root.destroy()
+        return
     root.mainloop()
 
 
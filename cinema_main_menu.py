@@ -1,5 +1,6 @@
 import os
 import sys
+import multiprocessing
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -220,4 +221,6 @@ class MainMenu(tk.Tk):
 
 
 if __name__ == "__main__":
+    # batch export renders in spawned processes; needed in the frozen app
+    multiprocessing.freeze_support()
     MainMenu().mainloop()
\ No newline at end of file
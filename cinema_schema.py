@@ -0,0 +1,311 @@
+"""
+Versioned schema migrations voor de borderel-tabellen (cinema_db).
+
+- Elke migratie heeft een versienummer; toegepaste versies staan in `schema_migrations`.
+- Elke stap controleert zelf via information_schema of ze nog nodig is, dus opnieuw
+  uitvoeren (of een DB die deels manueel via database_build.sql werd opgezet) is veilig.
+- GET_LOCK voorkomt dat twee werkposten tegelijk migreren.
+
+Gebruik:
+    conn = POOL.get_connection()
+    try:
+        apply_migrations(conn)
+    finally:
+        conn.close()
+"""
+
+SCHEMA_LOCK_NAME = "cinema_schema_migrations"
+SCHEMA_LOCK_TIMEOUT_SEC = 30
+
+
+# -----------------------------
+# information_schema helpers
+# -----------------------------
+def _table_exists(cur, table: str) -> bool:
+    cur.execute(
+        "SELECT COUNT(*) FROM information_schema.tables "
+        "WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,),
+    )
+    return int(cur.fetchone()[0]) > 0
+
+
+def _column_exists(cur, table: str, column: str) -> bool:
+    cur.execute(
+        "SELECT COUNT(*) FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+        (table, column),
+    )
+    return int(cur.fetchone()[0]) > 0
+
+
+def _index_exists(cur, table: str, index: str) -> bool:
+    cur.execute(
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+        (table, index),
+    )
+    return int(cur.fetchone()[0]) > 0
+
+
+def _cascading_fks(cur, table: str, column: str) -> list:
+    """(constraint, referenced table, referenced column) voor FK's op column met CASCADE/SET NULL/SET DEFAULT."""
+    cur.execute(
+        "SELECT k.constraint_name, k.referenced_table_name, k.referenced_column_name "
+        "FROM information_schema.key_column_usage k "
+        "JOIN information_schema.referential_constraints r "
+        "  ON r.constraint_schema = k.constraint_schema AND r.constraint_name = k.constraint_name "
+        "WHERE k.table_schema = DATABASE() AND k.table_name = %s AND k.column_name = %s "
+        "  AND k.referenced_table_name IS NOT NULL "
+        "  AND (r.update_rule <> 'RESTRICT' AND r.update_rule <> 'NO ACTION' "
+        "       OR r.delete_rule <> 'RESTRICT' AND r.delete_rule <> 'NO ACTION')",
+        (table, column),
+    )
+    return [(r[0], r[1], r[2]) for r in cur.fetchall()]
+
+
+def _make_fks_restrict(cur, table: str, column: str):
+    """Herschrijft cascading FK's op column naar ON DELETE/UPDATE RESTRICT (zelfde naam)."""
+    for name, ref_table, ref_column in _cascading_fks(cur, table, column):
+        cur.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {name}")
+        cur.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+            f"REFERENCES {ref_table}({ref_column}) ON DELETE RESTRICT ON UPDATE RESTRICT"
+        )
+
+
+def _add_column(cur, table: str, column: str, ddl: str):
+    if not _column_exists(cur, table, column):
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def _add_index(cur, table: str, index: str, ddl: str):
+    if not _index_exists(cur, table, index):
+        cur.execute(f"ALTER TABLE {table} ADD {ddl}")
+
+
+def _drop_index(cur, table: str, index: str):
+    if _index_exists(cur, table, index):
+        cur.execute(f"ALTER TABLE {table} DROP INDEX {index}")
+
+
+# -----------------------------
+# Migrations
+# -----------------------------
+def _m001_baseline(cur):
+    """Borderel-tabellen zoals in sql_dbase/database_build.sql (incl. latere ALTERs)."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS settings (
+          `key`   VARCHAR(64) PRIMARY KEY,
+          `value` TEXT NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS films (
+          id INT AUTO_INCREMENT PRIMARY KEY,
+          interne_titel   VARCHAR(255) NOT NULL,
+          maccsbox_titel  VARCHAR(255) NOT NULL,
+          distributeur    VARCHAR(255) NOT NULL,
+          land_herkomst   VARCHAR(100) NOT NULL,
+          actief TINYINT(1) NOT NULL DEFAULT 1,
+          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+          updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+          UNIQUE KEY uq_interne_titel (interne_titel)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS speelweek (
+          id INT AUTO_INCREMENT PRIMARY KEY,
+          weeknummer INT NOT NULL,
+          start_datum DATE NOT NULL,
+          eind_datum  DATE NOT NULL,
+          gesloten TINYINT(1) NOT NULL DEFAULT 0,
+          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+          updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+          UNIQUE KEY uq_week_range (start_datum, eind_datum),
+          UNIQUE KEY uq_weeknummer (weeknummer)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS zalen (
+          id INT AUTO_INCREMENT PRIMARY KEY,
+          naam VARCHAR(64) NOT NULL,
+          UNIQUE KEY uq_zaal (naam)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS daily_sales (
+          id BIGINT AUTO_INCREMENT PRIMARY KEY,
+          datum DATE NOT NULL,
+          speelweek_id INT NOT NULL,
+          film_id INT NOT NULL,
+          zaal_id INT NULL,
+          is_3d TINYINT(1) NOT NULL DEFAULT 0,
+          aantal_volw INT NOT NULL DEFAULT 0,
+          aantal_kind INT NOT NULL DEFAULT 0,
+          gratis_volw INT NOT NULL DEFAULT 0,
+          gratis_kind INT NOT NULL DEFAULT 0,
+          bedrag_volw DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+          bedrag_kind DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+          totaal_aantal INT NOT NULL DEFAULT 0,
+          totaal_bedrag DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+          source_file VARCHAR(255) NULL,
+          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+          updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+          CONSTRAINT fk_daily_week FOREIGN KEY (speelweek_id) REFERENCES speelweek(id)
+            ON DELETE RESTRICT ON UPDATE CASCADE,
+          CONSTRAINT fk_daily_film FOREIGN KEY (film_id) REFERENCES films(id)
+            ON DELETE RESTRICT ON UPDATE CASCADE,
+          CONSTRAINT fk_daily_zaal FOREIGN KEY (zaal_id) REFERENCES zalen(id)
+            ON DELETE RESTRICT ON UPDATE RESTRICT,
+          UNIQUE KEY uq_datum_film_zaal (datum, film_id, zaal_id),
+          KEY ix_week (speelweek_id),
+          KEY ix_film (film_id),
+          KEY ix_datum (datum)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+    # oudere installs: kolommen die later via ALTER TABLE werden toegevoegd
+    _add_column(cur, "daily_sales", "zaal_id", "INT NULL AFTER film_id")
+    _add_column(cur, "daily_sales", "gratis_volw", "INT NOT NULL DEFAULT 0 AFTER aantal_kind")
+    _add_column(cur, "daily_sales", "gratis_kind", "INT NOT NULL DEFAULT 0 AFTER gratis_volw")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ticket_ranges (
+          id INT AUTO_INCREMENT PRIMARY KEY,
+          speelweek_id INT NOT NULL,
+          film_id INT NOT NULL,
+          zaal_id INT NULL,
+          begin_volw INT NOT NULL,
+          begin_kind INT NOT NULL,
+          UNIQUE KEY uq_range (speelweek_id, film_id, zaal_id),
+          FOREIGN KEY (speelweek_id) REFERENCES speelweek(id),
+          FOREIGN KEY (film_id) REFERENCES films(id),
+          FOREIGN KEY (zaal_id) REFERENCES zalen(id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+
+def _m002_zaal_key(cur):
+    """
+    zaal_key = COALESCE(zaal_id, 0) als stored generated column (indexeerbaar i.p.v. COALESCE in WHERE).
+    MySQL weigert een stored generated column op een basiskolom met een CASCADE/SET NULL FK,
+    dus fk_daily_zaal (ON UPDATE CASCADE) wordt eerst RESTRICT; zalen.id wordt nooit gewijzigd.
+    """
+    for table in ("daily_sales", "ticket_ranges"):
+        _make_fks_restrict(cur, table, "zaal_id")
+        _add_column(
+            cur, table, "zaal_key",
+            "INT GENERATED ALWAYS AS (COALESCE(zaal_id, 0)) STORED AFTER zaal_id",
+        )
+
+
+def _m003_lookup_indexes(cur):
+    """Samengestelde indexes voor de hot lookups + watermark (updated_at)."""
+    _add_index(cur, "daily_sales", "ix_week_film_zaal", "KEY ix_week_film_zaal (speelweek_id, film_id, zaal_key)")
+    _add_index(cur, "daily_sales", "ix_datum", "KEY ix_datum (datum)")
+    _add_index(cur, "daily_sales", "ix_updated_at", "KEY ix_updated_at (updated_at)")
+    _add_index(cur, "speelweek", "ix_updated_at", "KEY ix_updated_at (updated_at)")
+    _add_index(cur, "ticket_ranges", "ix_film_zaal_week", "KEY ix_film_zaal_week (film_id, zaal_key, speelweek_id)")
+
+
+class SchemaConflictError(RuntimeError):
+    """Migratie gestopt: bestaande rijen botsen met een nieuwe unique key en moeten manueel opgelost worden."""
+
+
+SCHEMA_CONFLICT_REPORT_MAX = 50
+
+
+def _duplicate_groups(cur, table: str, key_cols: tuple) -> list:
+    """[(key-waarden, [ids])] voor rijen die dezelfde waarden hebben in key_cols."""
+    cols = ", ".join(key_cols)
+    cur.execute("SET SESSION group_concat_max_len = 1048576")   # standaard 1024 tekens kapt id-lijsten af
+    cur.execute(
+        f"SELECT {cols}, GROUP_CONCAT(id ORDER BY id) FROM {table} "
+        f"GROUP BY {cols} HAVING COUNT(*) > 1 ORDER BY {cols}"
+    )
+    return [(tuple(r[:-1]), [int(x) for x in str(r[-1]).split(",")]) for r in cur.fetchall()]
+
+
+def _check_no_duplicates(cur, table: str, key_cols: tuple):
+    """Stopt de migratie met een overzicht van de dubbels; er wordt niets verwijderd."""
+    groups = _duplicate_groups(cur, table, key_cols)
+    if not groups:
+        return
+    lines = [
+        f"  {', '.join(f'{c}={v}' for c, v in zip(key_cols, key))}: id {', '.join(map(str, ids))}"
+        for key, ids in groups[:SCHEMA_CONFLICT_REPORT_MAX]
+    ]
+    if len(groups) > SCHEMA_CONFLICT_REPORT_MAX:
+        lines.append(f"  … en nog {len(groups) - SCHEMA_CONFLICT_REPORT_MAX} groep(en)")
+    raise SchemaConflictError(
+        f"{table}: {len(groups)} groep(en) dubbele rijen op ({', '.join(key_cols)}).\n"
+        f"Los ze manueel op (behoud één rij per groep) en start opnieuw:\n" + "\n".join(lines)
+    )
+
+
+def _m004_upsert_unique_keys(cur):
+    """
+    Unique keys op zaal_key zodat ON DUPLICATE KEY ook werkt zonder zaal (NULL telt in MySQL niet als duplicate).
+    Bestaande dubbels zijn financiële data en worden niet automatisch verwijderd: de migratie
+    stopt met een SchemaConflictError die de botsende id's opsomt.
+    Nieuwe key eerst aanmaken, dan de oude droppen (FK op speelweek_id steunt op een index).
+    """
+    if not _index_exists(cur, "daily_sales", "uq_datum_film_zaalkey"):
+        _check_no_duplicates(cur, "daily_sales", ("datum", "film_id", "zaal_key"))
+        cur.execute("ALTER TABLE daily_sales ADD UNIQUE KEY uq_datum_film_zaalkey (datum, film_id, zaal_key)")
+    _drop_index(cur, "daily_sales", "uq_datum_film_zaal")
+
+    if not _index_exists(cur, "ticket_ranges", "uq_range_key"):
+        _check_no_duplicates(cur, "ticket_ranges", ("speelweek_id", "film_id", "zaal_key"))
+        cur.execute("ALTER TABLE ticket_ranges ADD UNIQUE KEY uq_range_key (speelweek_id, film_id, zaal_key)")
+    _drop_index(cur, "ticket_ranges", "uq_range")
+
+
+MIGRATIONS = [
+    (1, "baseline borderel tabellen", _m001_baseline),
+    (2, "zaal_key generated columns", _m002_zaal_key),
+    (3, "lookup indexes", _m003_lookup_indexes),
+    (4, "unique keys op zaal_key", _m004_upsert_unique_keys),
+]
+
+
+def applied_versions(cur) -> set:
+    if not _table_exists(cur, "schema_migrations"):
+        return set()
+    cur.execute("SELECT version FROM schema_migrations")
+    return {int(r[0]) for r in cur.fetchall()}
+
+
+def apply_migrations(conn) -> list:
+    """
+    Voert alle nog niet toegepaste migraties uit (in volgorde).
+    Geeft de lijst van nieuw toegepaste versies terug.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT GET_LOCK(%s, %s)", (SCHEMA_LOCK_NAME, SCHEMA_LOCK_TIMEOUT_SEC))
+    if not cur.fetchone()[0]:
+        raise RuntimeError("Kon schema-lock niet krijgen (migratie bezig op een andere werkpost?)")
+    try:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+              version INT PRIMARY KEY,
+              description VARCHAR(255) NOT NULL,
+              applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """)
+        done = applied_versions(cur)
+        applied = []
+        for version, description, step in MIGRATIONS:
+            if version in done:
+                continue
+            step(cur)
+            cur.execute(
+                "INSERT INTO schema_migrations(version, description) VALUES(%s, %s)",
+                (version, description),
+            )
+            conn.commit()
+            applied.append(version)
+        return applied
+    finally:
+        cur.execute("SELECT RELEASE_LOCK(%s)", (SCHEMA_LOCK_NAME,))
+        cur.fetchone()
@@ -29,7 +29,7 @@ hiddenimports = ['mysql.connector.plugins.caching_sha2_password']
 hiddenimports += collect_submodules('mysql.connector.plugins')
 
 # ✅ Zorg dat deze modules zeker mee in de build zitten (ook al wordt import soms “gemist”)
-hiddenimports += ['cinema_affiche', 'cinema_borderel']
+hiddenimports += ['cinema_affiche', 'cinema_borderel', 'cinema_schema']
 
 DATAS = []
 add_file("assets/logo.png", "assets")
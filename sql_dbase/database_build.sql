@@ -105,7 +105,7 @@ ALTER TABLE daily_sales
 ALTER TABLE daily_sales
   ADD CONSTRAINT fk_daily_zaal
     FOREIGN KEY (zaal_id) REFERENCES zalen(id)
-    ON DELETE RESTRICT ON UPDATE CASCADE;
+    ON DELETE RESTRICT ON UPDATE RESTRICT;  -- geen CASCADE: zaal_key (generated) steunt op zaal_id
 
 -- uniqueness becomes per date + film + zaal (so you can track per auditorium)
 ALTER TABLE daily_sales